@@ -1,11 +1,8 @@
 #!/usr/bin/env python3
 
-from collections import defaultdict
+from collections import deque
 from pathlib import Path
 from string import digits
-from math import inf
-
-input_path = Path(__file__).parent / "input"
 
 num_strs = [
     "zero",
@@ -20,21 +17,88 @@ num_strs = [
     "nine",
 ]
 
-total1 = total2 = 0
-for line in input_path.read_text().splitlines():
-    ds = [int(c) for c in line if c in digits]
-    total1 += 10 * ds[0] + ds[-1]
-
-    occs = defaultdict(list)
-    for i in range(len(line)):
-        if line[i] in digits:
-            occs[int(line[i])].append(i)
-        for num, s in enumerate(num_strs):
-            if line[i:i+len(s)] == s:
-                occs[num].append(i)
-    first = min(range(10), key=lambda d: occs[d][0] if len(occs[d]) > 0 else inf)
-    last = max(range(10), key=lambda d: occs[d][-1] if len(occs[d]) > 0 else -inf)
-    total2 += 10 * first + last
-
-print(total1)
-print(total2)
+
+class Scanner:
+    """Aho-Corasick automaton that finds the first of a set of words in a string.
+
+    Since none of the words contains another, the match that ends first is also
+    the one that starts first. Scanning stops at that match.
+    """
+
+    def __init__(self, values_of_words):
+        trie = [{}]
+        self.value_of_state = [None]
+        for word, value in values_of_words.items():
+            state = 0
+            for c in word:
+                if c not in trie[state]:
+                    trie[state][c] = len(trie)
+                    trie.append({})
+                    self.value_of_state.append(None)
+                state = trie[state][c]
+            self.value_of_state[state] = value
+
+        # complete the trie to a DFA over the alphabet of the words
+        alphabet = set("".join(values_of_words))
+        self.transitions = [dict() for _ in trie]
+        fail = [0] * len(trie)
+        queue = deque([0])
+        while queue:
+            u = queue.popleft()
+            for c in alphabet:
+                if c in trie[u]:
+                    v = trie[u][c]
+                    fail[v] = self.transitions[fail[u]].get(c, 0) if u != 0 else 0
+                    if self.value_of_state[v] is None:
+                        self.value_of_state[v] = self.value_of_state[fail[v]]
+                    self.transitions[u][c] = v
+                    queue.append(v)
+                elif u != 0 and (v := self.transitions[fail[u]].get(c, 0)) != 0:
+                    self.transitions[u][c] = v
+
+    def first(self, s):
+        state = 0
+        for c in s:
+            state = self.transitions[state].get(c, 0)
+            if (value := self.value_of_state[state]) is not None:
+                return value
+        raise ValueError(f"No digit in {s!r}")
+
+
+def calibration_value(line, forward, backward):
+    return 10 * forward.first(line) + backward.first(reversed(line))
+
+
+digit_words = {d: int(d) for d in digits}
+spelled_words = digit_words | {s: num for num, s in enumerate(num_strs)}
+
+forward1 = Scanner(digit_words)
+forward2 = Scanner(spelled_words)
+backward2 = Scanner({word[::-1]: num for word, num in spelled_words.items()})
+
+
+def calibration_sums(lines):
+    """Sums up both kinds of calibration values of a stream of lines in one pass."""
+    total1 = total2 = 0
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line:
+            continue
+        total1 += calibration_value(line, forward1, forward1)
+        total2 += calibration_value(line, forward2, backward2)
+    return total1, total2
+
+
+def solve(text):
+    yield from calibration_sums(text.splitlines())
+
+
+def main():
+    input_path = Path(__file__).parent / "input"
+    with input_path.open() as lines:
+        for answer in calibration_sums(lines):
+            print(answer)
+
+
+if __name__ == "__main__":
+    main()
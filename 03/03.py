@@ -1,61 +1,88 @@
 #!/usr/bin/env python3
 
 
-from collections import defaultdict
+import re
+from collections import deque
+from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 from string import digits
-from math import inf
-
-input_path = Path(__file__).parent / "input"
-input_data = input_path.read_text().splitlines()
-
-in_range = lambda x, y: 0 <= y < len(input_data) and 0 <= x < len(input_data[y])
-is_part = (
-    lambda x, y: in_range(x, y)
-    and input_data[y][x] not in digits
-    and input_data[y][x] != "."
-)
-
-
-def adj_cells(y, x_start, x_end):
-    yield x_start - 1, y
-    yield x_end, y
-    for x in range(x_start - 1, x_end + 1):
-        yield x, y - 1
-        yield x, y + 1
-
-
-def is_adj_to_any_part(y, x_start, x_end):
-    return any(is_part(x, y) for x, y in adj_cells(y, x_start, x_end))
-
-
-total1 = 0
-
-nums_adj_to_gear = defaultdict(list)
-
-for y in range(len(input_data)):
-    digit_start = None
-    for x in range(len(input_data[y])):
-        if input_data[y][x] in digits and digit_start is None:
-            digit_start = x
-        elif input_data[y][x] not in digits and digit_start is not None:
-            if is_adj_to_any_part(y, digit_start, x):
-                total1 += int(input_data[y][digit_start:x])
-            for gx, gy in adj_cells(y, digit_start, x):
-                if in_range(gx, gy) and input_data[gy][gx] == "*":
-                    nums_adj_to_gear[(gx, gy)].append(int(input_data[y][digit_start:x]))
-            digit_start = None
-    x = len(input_data[y])
-    if digit_start is not None and is_adj_to_any_part(y, digit_start, x):
-        total1 += int(input_data[y][digit_start:x])
-        for gx, gy in adj_cells(y, digit_start, x):
-            if in_range(gx, gy) and input_data[gy][gx] == "*":
-                nums_adj_to_gear[(gx, gy)].append(int(input_data[y][digit_start:x]))
-
-print(total1)
-
-total2 = 0
-for adj_nums in nums_adj_to_gear.values():
-    if len(adj_nums) == 2:
-        total2 += adj_nums[0] * adj_nums[1]
-print(total2)
+
+
+# Byte tables that turn a row into the bits of a bitmask, one byte per column
+SYMBOL_BITS = bytes(b"01"[chr(b) not in digits + "."] for b in range(256))
+GEAR_BITS = bytes(b"01"[chr(b) == "*"] for b in range(256))
+
+
+@dataclass(frozen=True, slots=True)
+class Row:
+    """A schematic row, with bit `x` of the masks standing for column `x`."""
+
+    symbols: int
+    gears: int
+    numbers: list[tuple[int, int]]  # (mask of the span, value)
+
+    @classmethod
+    def parse(cls, line):
+        line = line.rstrip("\n").encode()
+        return cls(
+            symbols=int(line.translate(SYMBOL_BITS)[::-1] or b"0", 2),
+            gears=int(line.translate(GEAR_BITS)[::-1] or b"0", 2),
+            numbers=[
+                ((1 << m.end()) - (1 << m.start()), int(m.group()))
+                for m in re.finditer(rb"\d+", line)
+            ],
+        )
+
+
+EMPTY_ROW = Row(0, 0, [])
+
+
+def dilate(mask):
+    return mask | mask << 1 | mask >> 1
+
+
+def schematic_sums(lines):
+    """Sums up part numbers and gear ratios of a stream of rows.
+
+    Only a window of three rows is kept: the middle row is finished once the
+    row below it is known.
+    """
+    total1 = total2 = 0
+    window = deque([EMPTY_ROW, EMPTY_ROW], maxlen=3)
+    for row in chain(map(Row.parse, lines), [EMPTY_ROW]):
+        window.append(row)
+        above, middle, below = window
+
+        adjacent_to_symbol = dilate(above.symbols | middle.symbols | below.symbols)
+        total1 += sum(
+            value for span, value in middle.numbers if span & adjacent_to_symbol
+        )
+
+        gears = middle.gears
+        while gears:
+            gear = gears & -gears
+            gears ^= gear
+            around_gear = dilate(gear)
+            adjacent_numbers = [
+                value for r in window for span, value in r.numbers if span & around_gear
+            ]
+            if len(adjacent_numbers) == 2:
+                total2 += adjacent_numbers[0] * adjacent_numbers[1]
+
+    return total1, total2
+
+
+def solve(text):
+    yield from schematic_sums(text.splitlines())
+
+
+def main():
+    input_path = Path(__file__).parent / "input"
+    with input_path.open() as lines:
+        for answer in schematic_sums(lines):
+            print(answer)
+
+
+if __name__ == "__main__":
+    main()
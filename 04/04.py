@@ -1,24 +1,58 @@
 #!/usr/bin/env python3
 
 import sys
-from collections import Counter
 
-cards = sys.stdin.read().strip().splitlines()
 
-total1 = 0
-card_counts = Counter(range(len(cards)))
+def number_bits(numbers_str):
+    bits = 0
+    for n in numbers_str.split():
+        bits |= 1 << int(n)
+    return bits
 
-for i, card in enumerate(cards):
-    _, numbers = card.split(": ", 1)
-    winning_numbers_str, played_numbers_str = numbers.split(" | ")
-    winning_numbers = list(map(int, winning_numbers_str.strip().split()))
-    played_numbers = list(map(int, played_numbers_str.strip().split()))
-    matches = len(set(winning_numbers) & set(played_numbers))
 
-    if matches > 0:
-        total1 += 1 << (matches - 1)
+def scratchcard_sums(cards):
+    """Sums up points and scratchcard copies of a stream of cards in one pass.
 
-    for j in range(i + 1, min(i + 1 + matches, len(cards))):
-        card_counts[j] += card_counts[i]
-print(total1)
-print(sum(card_counts.values()))
+    The copies won for upcoming cards are kept in a ring buffer, which only needs
+    as many slots as a card can have matches. It grows when a card has more
+    winning numbers than any card before it.
+    """
+    total1 = total2 = 0
+    pending_copies = [0]
+
+    for i, card in enumerate(filter(str.strip, cards)):
+        _, numbers = card.split(": ", 1)
+        winning_numbers_str, played_numbers_str = numbers.split(" | ")
+        winning_bits = number_bits(winning_numbers_str)
+        if (max_matches := winning_bits.bit_count()) > len(pending_copies):
+            # Move the copies for cards i, i + 1, ... to their slots in the new size
+            grown = [0] * max_matches
+            for j in range(i, i + len(pending_copies)):
+                grown[j % max_matches] = pending_copies[j % len(pending_copies)]
+            pending_copies = grown
+        matches = (winning_bits & number_bits(played_numbers_str)).bit_count()
+
+        if matches > 0:
+            total1 += 1 << (matches - 1)
+
+        slot = i % len(pending_copies)
+        copies = 1 + pending_copies[slot]
+        pending_copies[slot] = 0
+        total2 += copies
+        for j in range(i + 1, i + 1 + matches):
+            pending_copies[j % len(pending_copies)] += copies
+
+    return total1, total2
+
+
+def solve(text):
+    yield from scratchcard_sums(text.splitlines())
+
+
+def main():
+    for answer in scratchcard_sums(sys.stdin):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
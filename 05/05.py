@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 
 import sys
-from typing import Self, Iterable
+from bisect import bisect_right
+from functools import reduce
+from math import inf
+from typing import Self, Iterable, Iterator
 from dataclasses import dataclass
 
 
@@ -10,123 +13,174 @@ class Interval:
     start: int
     end: int
 
-    def intersection(self, other: Self) -> Self:
-        return type(self)(max(self.start, other.start), min(self.end, other.end))
-
-    def difference(self, other: Self):
-        if self.intersection(other).is_empty():
-            yield self
-            return
-        if other.start > self.start:
-            yield Interval(self.start, min(self.end, other.start))
-        if other.end < self.end:
-            yield Interval(max(self.start, other.end), self.end)
-
     def is_empty(self) -> bool:
         return self.start >= self.end
 
-    def shift(self, offset: int) -> Self:
-        return type(self)(self.start + offset, self.end + offset)
-
 
 class IntervalSet:
-    intervals: set[Interval]
+    """A union of intervals, stored as the sorted boundaries of disjoint intervals.
+
+    The intervals are `[boundaries[i], boundaries[i + 1])` for even `i`. Touching
+    intervals are coalesced, so the boundaries are strictly increasing.
+    """
+
+    boundaries: list[int]
 
     def __init__(self, initial: Iterable[Interval] = list()) -> None:
-        self.intervals = set()
-        for interval in initial:
-            self.add(interval)
-
-    def rebuild(self):
-        events = []
-        for interval in self.intervals:
-            events.append((interval.start, False))
-            events.append((interval.end, True))
-        self.intervals.clear()
-
-        active = start = 0
-        for time, is_end in events:
-            if not is_end:
-                active += 1
-                if active == 1:
-                    start = time
+        self.boundaries = []
+        self.rebuild(initial)
+
+    def __iter__(self) -> Iterator[Interval]:
+        for i in range(0, len(self.boundaries), 2):
+            yield Interval(self.boundaries[i], self.boundaries[i + 1])
+
+    def __len__(self) -> int:
+        return len(self.boundaries) // 2
+
+    def rebuild(self, intervals: Iterable[Interval]):
+        boundaries = []
+        for interval in sorted(intervals):
+            if interval.is_empty():
+                continue
+            if boundaries and interval.start <= boundaries[-1]:
+                boundaries[-1] = max(boundaries[-1], interval.end)
             else:
-                active -= 1
-                if active == 0:
-                    self.intervals.add(Interval(start, time))
-
-    def add(self, interval: Interval):
-        if not interval.is_empty():
-            self.intervals.add(interval)
-
-    def remove(self, interval: Interval):
-        new_intervals = set()
-        for old_interval in self.intervals:
-            for new_interval in old_interval.difference(interval):
-                new_intervals.add(new_interval)
-        self.intervals = new_intervals
-
-    def extract(self, interval: Interval):
-        extracted = set(
-            i.intersection(interval)
-            for i in self.intervals
-            if not i.intersection(interval).is_empty()
+                boundaries += [interval.start, interval.end]
+        self.boundaries = boundaries
+
+
+class PiecewiseShift:
+    """A map of the non-negative integers that adds a constant on each piece.
+
+    Piece `i` is `[starts[i], starts[i + 1])` and adds `offsets[i]`; the last piece
+    extends to infinity. Neighbouring pieces have different offsets.
+    """
+
+    starts: list[int]
+    offsets: list[int]
+
+    def __init__(self, pieces: Iterable[tuple[int, int]] = [(0, 0)]) -> None:
+        self.starts = []
+        self.offsets = []
+        for start, offset in pieces:
+            if self.starts and self.starts[-1] == start:
+                self.starts.pop()
+                self.offsets.pop()
+            if not self.offsets or self.offsets[-1] != offset:
+                self.starts.append(start)
+                self.offsets.append(offset)
+        assert self.starts[0] == 0
+
+    @classmethod
+    def from_shifts(cls, shifts: Iterable[tuple[Interval, int]]) -> Self:
+        pieces = [(0, 0)]
+        for source, offset in sorted(shifts):
+            assert source.start >= pieces[-1][0]
+            pieces += [(source.start, offset), (source.end, 0)]
+        return cls(pieces)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def piece_index(self, value: int) -> int:
+        return bisect_right(self.starts, value) - 1
+
+    def __call__(self, value: int) -> int:
+        return value + self.offsets[self.piece_index(value)]
+
+    def then(self, other: Self) -> Self:
+        """The composition that applies `self` first and `other` second."""
+        pieces = []
+        for i, offset in enumerate(self.offsets):
+            # cut the image of piece i along the pieces of other
+            image_start = self.starts[i] + offset
+            image_end = self.starts[i + 1] + offset if i + 1 < len(self) else inf
+            j = other.piece_index(image_start)
+            while j < len(other) and other.starts[j] < image_end:
+                start = max(image_start, other.starts[j]) - offset
+                pieces.append((start, offset + other.offsets[j]))
+                j += 1
+        return type(self)(pieces)
+
+    def map_points(self, points: Iterable[int]) -> list[int]:
+        """Maps a batch of points with a single merge over the sorted points."""
+        points = list(points)
+        mapped = [0] * len(points)
+        i = 0
+        for k in sorted(range(len(points)), key=points.__getitem__):
+            while i + 1 < len(self) and self.starts[i + 1] <= points[k]:
+                i += 1
+            mapped[k] = points[k] + self.offsets[i]
+        return mapped
+
+    def min_over(self, intervals: IntervalSet) -> int:
+        """The smallest value that any point of the intervals is mapped to."""
+        return min(
+            max(interval.start, self.starts[j]) + self.offsets[j]
+            for interval in intervals
+            for j in range(
+                self.piece_index(interval.start),
+                self.piece_index(interval.end - 1) + 1,
+            )
         )
-        self.remove(interval)
-        return extracted
 
-    def apply_shifts(self, shifts: Iterable[tuple[Interval, int]]):
-        to_add = list()
-        for source, offset in shifts:
-            extracted = self.extract(source)
-            for interval in extracted:
-                to_add.append(interval.shift(offset))
-        for interval in to_add:
-            self.add(interval)
-        self.rebuild()
 
-    def min(self) -> int:
-        return min(i.start for i in self.intervals)
+def compile_almanac(layers: list[list[tuple[Interval, int]]]) -> PiecewiseShift:
+    """Composes the layers into one map from seeds to locations."""
+    return reduce(
+        PiecewiseShift.then, map(PiecewiseShift.from_shifts, layers), PiecewiseShift()
+    )
+
+
+def parse_almanac(text):
+    input_lines = text.splitlines()
 
+    _, seed_list_str = input_lines[0].strip().split("seeds: ", 1)
+    seeds = list(map(int, seed_list_str.split()))
 
-input_lines = sys.stdin.readlines()
+    layers = []
+    line_index = 1
 
-_, seed_list_str = input_lines[0].strip().split("seeds: ", 1)
+    while line_index < len(input_lines):
+        assert input_lines[line_index].strip() == ""
 
-# part 1
-points = list(map(int, seed_list_str.split()))
+        line_index += 2
+        shifts = []
+        while line_index < len(input_lines) and input_lines[line_index].strip() != "":
+            dst_range_start, src_range_start, range_len = map(
+                int, input_lines[line_index].strip().split()
+            )
+            shifts.append(
+                (
+                    Interval(src_range_start, src_range_start + range_len),
+                    dst_range_start - src_range_start,
+                )
+            )
 
-# part 2
-current_intervals = IntervalSet(
-    Interval(points[i], points[i] + points[i + 1]) for i in range(0, len(points), 2)
-)
+            line_index += 1
+        layers.append(shifts)
 
-line_index = 1
+    return seeds, layers
 
-while line_index < len(input_lines):
-    assert input_lines[line_index].strip() == ""
 
-    line_index += 2
-    new_points = points.copy()
-    shifts = []
-    while line_index < len(input_lines) and input_lines[line_index].strip() != "":
-        dst_range_start, src_range_start, range_len = map(
-            int, input_lines[line_index].strip().split()
-        )
+def solve(text):
+    seeds, layers = parse_almanac(text)
+    seed_to_location = compile_almanac(layers)
 
-        for i, value in enumerate(points):
-            if src_range_start <= value < src_range_start + range_len:
-                new_points[i] = dst_range_start + value - src_range_start
-        shifts.append(
-            (
-                Interval(src_range_start, src_range_start + range_len),
-                dst_range_start - src_range_start,
-            )
-        )
+    # part 1
+    yield min(seed_to_location.map_points(seeds))
+
+    # part 2
+    seed_ranges = IntervalSet(
+        Interval(seeds[i], seeds[i] + seeds[i + 1]) for i in range(0, len(seeds), 2)
+    )
+    yield seed_to_location.min_over(seed_ranges)
+
+
+def main():
+    for answer in solve(sys.stdin.read()):
+        print(answer)
 
-        line_index += 1
-    points = new_points
-    current_intervals.apply_shifts(shifts)
 
-print(min(points))
-print(current_intervals.min())
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,55 @@
 #!/usr/bin/env python3
 
-from more_itertools import ilen
 from functools import reduce
+from math import isqrt
 import operator
+import sys
 
 
 def possibilities(time, record_distance):
-    return ilen(
-        filter(
-            lambda d: d > record_distance,
-            map(lambda t: t * (time - t), range(time + 1)),
-        )
-    )
-
-
-times_str = input().removeprefix("Time:").strip()
-record_distances_str = input().removeprefix("Distance:").strip()
-
-times1 = list(map(int, times_str.split()))
-record_distances1 = list(map(int, record_distances_str.split()))
-total1 = reduce(
-    operator.mul, (possibilities(t, d) for t, d in zip(times1, record_distances1)), 1
-)
-print(total1)
-
-time2 = int(times_str.replace(" ", ""))
-record_distance2 = int(record_distances_str.replace(" ", ""))
-print(possibilities(time2, record_distance2))
+    """Number of hold durations `t` with `t * (time - t) > record_distance`.
+
+    The distance is symmetric around `time / 2`, so it suffices to find the
+    smallest winning `t` below that. It is just above the smaller root of
+    `t * (time - t) = record_distance`, which `isqrt` gets to within a step.
+    """
+    beats_record = lambda t: t * (time - t) > record_distance
+    discriminant = time * time - 4 * record_distance
+    if discriminant < 0:
+        return 0
+
+    first = max(0, (time - isqrt(discriminant)) // 2)
+    while first > 0 and beats_record(first - 1):
+        first -= 1
+    while first <= time // 2 and not beats_record(first):
+        first += 1
+    if first > time // 2:
+        return 0
+    return time - 2 * first + 1
+
+
+def possibilities_of_races(times, record_distances):
+    return [possibilities(t, d) for t, d in zip(times, record_distances)]
+
+
+def solve(text):
+    times_line, record_distances_line = text.splitlines()[:2]
+    times_str = times_line.removeprefix("Time:").strip()
+    record_distances_str = record_distances_line.removeprefix("Distance:").strip()
+
+    times1 = list(map(int, times_str.split()))
+    record_distances1 = list(map(int, record_distances_str.split()))
+    yield reduce(operator.mul, possibilities_of_races(times1, record_distances1), 1)
+
+    time2 = int(times_str.replace(" ", ""))
+    record_distance2 = int(record_distances_str.replace(" ", ""))
+    yield possibilities(time2, record_distance2)
+
+
+def main():
+    for answer in solve(sys.stdin.read()):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
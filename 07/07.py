@@ -1,60 +1,87 @@
 #!/usr/bin/env python3
 
 import sys
-from itertools import repeat, chain
 from collections import Counter
 
-joker_mode = len(sys.argv) > 1 and sys.argv[1] == "--joker"
 
+fps_in_order = [
+    (1, 1, 1, 1, 1),
+    (1, 1, 1, 2),
+    (1, 2, 2),
+    (1, 1, 3),
+    (2, 3),
+    (1, 4),
+    (5,),
+]
 
-def card_key(card):
-    if not joker_mode:
-        return "23456789TJQKA".index(card)
-    return "J23456789TQKA".index(card)
 
+def best_hand_type(fp, jokers):
+    # The jokers are always best spent on the most frequent card
+    if not fp:
+        return fps_in_order.index((jokers,))
+    return fps_in_order.index((*fp[:-1], fp[-1] + jokers))
 
-def hand_type(card):
-    fps_in_order = [
-        [1, 1, 1, 1, 1],
-        [1, 1, 1, 2],
-        [1, 2, 2],
-        [1, 1, 3],
-        [2, 3],
-        [1, 4],
-        [5],
-    ]
 
-    if not joker_mode:
-        fp = sorted(Counter(card).values())
-        return fps_in_order.index(fp)
+def partitions(total, largest=5):
+    """All ascending tuples of positive counts that sum up to `total`."""
+    if total == 0:
+        yield ()
+        return
+    for last in range(min(total, largest), 0, -1):
+        for rest in partitions(total - last, last):
+            yield (*rest, last)
 
-    c = Counter(card)
-    jokers = c.pop("J", 0)
-    fp = sorted(c.values())
 
-    pad = lambda fp: chain(repeat(0, 5 - len(fp)), fp)
+# Hand type for every count pattern of the non-joker cards and number of jokers
+hand_type_of = {
+    (fp, jokers): best_hand_type(fp, jokers)
+    for jokers in range(6)
+    for fp in partitions(5 - jokers)
+}
 
-    for i, target_fp in reversed(list(enumerate(fps_in_order))):
-        remaining_jokers = jokers
-        for card_count, target_count in zip(pad(fp), pad(target_fp)):
-            if card_count > target_count:
-                break
-            remaining_jokers -= target_count - card_count
-            if remaining_jokers < 0:
-                break
-        else:
-            return i
+card_values = {c: i for i, c in enumerate("23456789TJQKA")}
+joker_card_values = {c: i for i, c in enumerate("J23456789TQKA")}
 
-    raise ValueError(f"No type reachable: {card}")
 
+def hand_keys(hand):
+    """Packs a hand into one integer sort key for each rule set.
 
-def hand_key(card):
-    return (hand_type(card), tuple(map(card_key, card)))
+    The type takes the high bits, followed by four bits for each card.
+    """
+    counts = Counter(hand)
+    normal_type = hand_type_of[tuple(sorted(counts.values())), 0]
+    jokers = counts.pop("J", 0)
+    joker_type = hand_type_of[tuple(sorted(counts.values())), jokers]
 
+    normal_key, joker_key = normal_type, joker_type
+    for card in hand:
+        normal_key = normal_key << 4 | card_values[card]
+        joker_key = joker_key << 4 | joker_card_values[card]
+    return normal_key, joker_key
 
-cards_with_bids = sorted(
-    ((t.split()[0], int(t.split()[1])) for t in sys.stdin.read().strip().splitlines()),
-    key=lambda t: hand_key(t[0]),
-)
-total_winnings = sum(i * b for i, (_, b) in enumerate(cards_with_bids, start=1))
-print(total_winnings)
+
+def total_winnings(keys, bids):
+    ranked = sorted(range(len(keys)), key=keys.__getitem__)
+    return sum(rank * bids[i] for rank, i in enumerate(ranked, start=1))
+
+
+def solve(text):
+    normal_keys, joker_keys, bids = [], [], []
+    for line in text.strip().splitlines():
+        hand, bid = line.split()
+        normal_key, joker_key = hand_keys(hand)
+        normal_keys.append(normal_key)
+        joker_keys.append(joker_key)
+        bids.append(int(bid))
+
+    yield total_winnings(normal_keys, bids)
+    yield total_winnings(joker_keys, bids)
+
+
+def main():
+    for answer in solve(sys.stdin.read()):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,216 @@
 #!/usr/bin/env python3
 
-import itertools
 import sys
-from collections import defaultdict
-from math import lcm
+from dataclasses import dataclass
+from math import gcd, inf, lcm
 
-data = sys.stdin.readlines()
 
-directions = data[0].strip()
+class Network:
+    """The network with the nodes interned to ids and the successors in flat lists.
 
-g = defaultdict(list)
-for line in data[2:]:
-    lhs, rhs = line.split(" = ", 1)
-    r1, r2 = rhs.strip("\n()").split(", ")
-    g[lhs].append(r1)
-    g[lhs].append(r2)
+    `successors[goes_right[i]][v]` is the node after `v` at instruction `i`.
+    """
 
+    def __init__(self, directions, edges):
+        self.names = list(edges)
+        self.id_of = {name: v for v, name in enumerate(self.names)}
+        self.successors = [
+            [self.id_of[edges[name][side]] for name in self.names] for side in (0, 1)
+        ]
+        self.goes_right = [direction == "R" for direction in directions]
 
-def traverse_naive(starts, is_end):
-    cur = starts
-    for i, direction in enumerate(itertools.cycle(directions)):
-        if all(map(is_end, cur)):
-            print(i)
-            return
-        cur = [g[v][direction == "R"] for v in cur]
+    def __len__(self):
+        return len(self.names)
 
+    def ids(self, predicate):
+        return [v for v, name in enumerate(self.names) if predicate(name)]
 
-def find_cycle_length(start, is_end):
-    start = (start, 0)
+    def step(self, v, i):
+        return self.successors[self.goes_right[i % len(self.goes_right)]][v]
 
-    succ = lambda vi: (
-        g[vi[0]][directions[vi[1]] == "R"],
-        (vi[1] + 1) % len(directions),
+
+def parse_network(text):
+    data = text.splitlines()
+
+    directions = data[0].strip()
+
+    edges = {}
+    for line in data[2:]:
+        if not line.strip():
+            continue
+        lhs, rhs = line.split(" = ", 1)
+        r1, r2 = rhs.strip("\n()").split(", ")
+        edges[lhs] = (r1, r2)
+
+    return Network(directions, edges)
+
+
+class JumpTable:
+    """Binary lifting over whole passes through the instructions.
+
+    `level(j, v)` is the node that the walk from `v` is on after `2 ** j` passes,
+    together with the first step within those passes at which it is on an end
+    node, or `inf` if there is none. The entries are computed as queries reach
+    them, so only the pass starts on the queried walks are ever walked.
+    """
+
+    def __init__(self, network, is_end):
+        self.network = network
+        self.is_end = is_end
+        self.pass_length = len(network.goes_right)
+        self.levels = []
+
+    def level(self, j, v):
+        while len(self.levels) <= j:
+            self.levels.append({})
+        if v in self.levels[j]:
+            return self.levels[j][v]
+
+        if j == 0:
+            u, first_end = v, inf
+            for i in range(self.pass_length):
+                if first_end == inf and self.is_end[u]:
+                    first_end = i
+                u = self.network.step(u, i)
+        else:
+            middle, first_end = self.level(j - 1, v)
+            u, second_end = self.level(j - 1, middle)
+            if first_end == inf:
+                first_end = (1 << (j - 1)) * self.pass_length + second_end
+        self.levels[j][v] = u, first_end
+        return u, first_end
+
+    def positions(self, starts, k):
+        """The nodes that the walks from the starts are on after `k` steps."""
+        passes, rest = divmod(k, self.pass_length)
+        vs = list(starts)
+        for j in range(passes.bit_length()):
+            if passes >> j & 1:
+                vs = [self.level(j, v)[0] for v in vs]
+        for i in range(rest):
+            vs = [self.network.step(v, i) for v in vs]
+        return vs
+
+    def first_end_from(self, start, k=0):
+        """The first step `>= k` at which the walk from `start` is on an end node.
+
+        Returns `None` if the walk never gets to an end node again.
+        """
+        passes, rest = divmod(k, self.pass_length)
+        (v,) = self.positions([start], passes * self.pass_length)
+        for i in range(self.pass_length):
+            if i >= rest and self.is_end[v]:
+                return passes * self.pass_length + i
+            v = self.network.step(v, i)
+        step = (passes + 1) * self.pass_length
+
+        # Find the first level that contains an end, so that the work grows with
+        # the answer. A walk that is on no end node for as many passes as there
+        # are nodes has run through a whole cycle of pass starts, so it never will
+        # be.
+        top = 0
+        while self.level(top, v)[1] == inf:
+            if 1 << top >= len(self.network):
+                return None
+            top += 1
+        for j in reversed(range(top)):
+            u, first_end = self.level(j, v)
+            if first_end == inf:
+                step += (1 << j) * self.pass_length
+                v = u
+        return step + self.level(0, v)[1]
+
+
+@dataclass(frozen=True)
+class Walk:
+    """The steps of a walk at which it is on an end node.
+
+    The walk runs through a prefix of distinct states into a cycle of states,
+    where a state is a node together with the position in the instructions.
+    """
+
+    prefix_length: int
+    cycle_length: int
+    prefix_ends: list[int]
+    cycle_ends: list[int]
+
+    def is_end_at(self, step):
+        if step < self.prefix_length:
+            return step in self.prefix_ends
+        step = self.prefix_length + (step - self.prefix_length) % self.cycle_length
+        return step in self.cycle_ends
+
+
+def find_walk(network, start, is_end):
+    pass_length = len(network.goes_right)
+    disc = {}
+    ends = []
+    v, i = start, 0
+    while (state := v * pass_length + i) not in disc:
+        disc[state] = len(disc)
+        if is_end[v]:
+            ends.append(disc[state])
+        v, i = network.step(v, i), (i + 1) % pass_length
+    prefix_length = disc[state]
+    return Walk(
+        prefix_length=prefix_length,
+        cycle_length=len(disc) - prefix_length,
+        prefix_ends=[step for step in ends if step < prefix_length],
+        cycle_ends=[step for step in ends if step >= prefix_length],
     )
 
-    prev = start
-    disc = {start: 0}
-    end_at = None
-    while (s := succ(prev)) not in disc:
-        disc[s] = disc[prev] + 1
-        if is_end(prev[0]):
-            assert end_at is None
-            end_at = disc[prev]
-        prev = s
-    cycle_start = disc[succ(prev)]
-    assert cycle_start <= end_at
-    assert end_at == len(disc) - cycle_start
-    return len(disc) - cycle_start
-
-
-def traverse_with_assumptions(starts, is_end):
-    # Observations:
-    # - Each start goes into a cycle after < 10 steps.
-    # - In each cycle, there is exactly one end.
-    # - This end is exactly where the start would be, if the cycle would come back to it.
-    # - Therefore, it takes one full cycle length from the start to get to this end node.
-    # - The end is reached after any positive amount of full cycles.
-    # The first time everyone is on an end is the lowest common multiple of the cycle lengths for each of the starts.
-    print(lcm(*(find_cycle_length(v, is_end) for v in starts)))
-
-
-traverse_naive(["AAA"], lambda v: v == "ZZZ")
-traverse_with_assumptions(
-    [v for v in g.keys() if v.endswith("A")], lambda v: v.endswith("Z")
-)
+
+def crt(a, m, b, n):
+    """Solves x = a (mod m) and x = b (mod n), for moduli that may share factors."""
+    g = gcd(m, n)
+    if (b - a) % g != 0:
+        return None
+    k = (b - a) // g * pow(m // g, -1, n // g) % (n // g)
+    return (a + m * k) % lcm(m, n)
+
+
+def first_common_end(network, starts, is_end):
+    """The first step at which all walks from the starts are on end nodes at once."""
+    walks = [find_walk(network, v, is_end) for v in starts]
+
+    # Before the longest prefix is done, that walk has only a few ends to check
+    longest = max(walks, key=lambda walk: walk.prefix_length)
+    for step in longest.prefix_ends:
+        if all(walk.is_end_at(step) for walk in walks):
+            return step
+
+    # Afterwards, every walk is in its cycle and allows some residues of the step
+    residues, modulus = {0}, 1
+    for walk in walks:
+        residues = {
+            x
+            for a in residues
+            for b in walk.cycle_ends
+            if (x := crt(a, modulus, b, walk.cycle_length)) is not None
+        }
+        modulus = lcm(modulus, walk.cycle_length)
+    if not residues:
+        raise ValueError("The walks are never on end nodes at the same time")
+    return min(
+        longest.prefix_length + (r - longest.prefix_length) % modulus for r in residues
+    )
+
+
+def solve(text):
+    network = parse_network(text)
+
+    is_zzz = [name == "ZZZ" for name in network.names]
+    yield JumpTable(network, is_zzz).first_end_from(network.id_of["AAA"])
+
+    starts = network.ids(lambda name: name.endswith("A"))
+    is_end = [name.endswith("Z") for name in network.names]
+    yield first_common_end(network, starts, is_end)
+
+
+def main():
+    for answer in solve(sys.stdin.read()):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,65 @@
 #!/usr/bin/env python3
 
 import sys
+from collections import defaultdict
+from math import comb
 from pathlib import Path
 
-import more_itertools
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().splitlines()
+def extrapolation_weights(length, steps=1):
+    """Weights `w` such that `sum(w[i] * values[i])` is the value `steps` places
+    after the last of `length` values.
 
-difference_array = lambda arr: [b - a for a, b in more_itertools.pairwise(arr)]
+    These are the Lagrange weights of the polynomial through the values, which is
+    what repeatedly taking differences until they are all zero extrapolates.
+    """
+    x = length - 1 + steps
+    return [
+        (-1) ** (length - 1 - i) * comb(x, i) * comb(x - i - 1, length - 1 - i)
+        for i in range(length)
+    ]
 
 
-def predict_value(arr):
-    if set(arr) == {0}:
-        return 0
-    return arr[-1] + predict_value(difference_array(arr))
+def column_sums(lines):
+    """Sums up the histories column by column, separately for each length."""
+    sums = defaultdict(list)
+    for line in lines:
+        values = list(map(int, line.split()))
+        if not values:
+            continue
+        block = sums[len(values)]
+        if not block:
+            block.extend(values)
+        else:
+            for i, value in enumerate(values):
+                block[i] += value
+    return sums
 
 
-predicted_values = map(
-    lambda line: predict_value(list(map(int, line.strip().split()))), data
-)
-print(sum(predicted_values))
+def extrapolation_sums(lines, steps=1):
+    """Sums up the values `steps` places after and before all histories.
 
-predicted_values_backwards = map(
-    lambda line: predict_value(list(map(int, reversed(line.strip().split())))), data
-)
-print(sum(predicted_values_backwards))
+    Histories of the same length share their weights, so the sum of all their
+    extrapolations is the extrapolation of their column sums.
+    """
+    forward = backward = 0
+    for length, sums in column_sums(lines).items():
+        weights = extrapolation_weights(length, steps)
+        forward += sum(w * s for w, s in zip(weights, sums))
+        backward += sum(w * s for w, s in zip(weights, reversed(sums)))
+    return forward, backward
+
+
+def solve(text, steps=1):
+    yield from extrapolation_sums(text.splitlines(), steps)
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
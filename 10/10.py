@@ -1,21 +1,13 @@
 #!/usr/bin/env python3
 
 import sys
-from collections import defaultdict
 from pathlib import Path
 
-import more_itertools
 
+north, east, south, west = range(4)
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().splitlines()
-
-north = (0, -1)
-south = (0, 1)
-west = (-1, 0)
-east = (1, 0)
-
-directions = (north, west, south, east)
+# (dx, dy) of each direction
+steps = ((0, -1), (1, 0), (0, 1), (-1, 0))
 
 pipe_kinds = {
     "|": (north, south),
@@ -26,102 +18,57 @@ pipe_kinds = {
     "F": (east, south),
 }
 
-g = defaultdict(set)
-start = None
-for y, row in enumerate(data):
-    for x, c in enumerate(row):
-        if c == "S":
-            assert start is None
-            start = x, y
-        if c in pipe_kinds:
-            for dx, dy in pipe_kinds[c]:
-                g[(x, y)].add((x + dx, y + dy))
-                g[(x + dx, y + dy)].add((x, y))
-
-assert start is not None
-assert len(g[start]) == 2
-
-prev = start
-cur = next(iter(g[start]))
-loop_vertices = [start]
-
-while cur != start:
-    loop_vertices.append(cur)
-    for dx, dy in pipe_kinds[data[cur[1]][cur[0]]]:
-        n = cur[0] + dx, cur[1] + dy
-        if n != prev:
-            prev = cur
-            cur = n
+# For each pipe and direction of moving onto it, the direction of moving off it
+turns = {}
+for c, (a, b) in pipe_kinds.items():
+    turns[c, (a + 2) % 4] = b
+    turns[c, (b + 2) % 4] = a
+
+
+def trace_loop(data):
+    """Follows the loop through S and returns its length and its enclosed area.
+
+    The rows are joined into one string with a padding column, so that moving is
+    adding an offset to an index. The area is summed up with the shoelace
+    formula along the way.
+    """
+    stride = max(map(len, data)) + 1
+    grid = "".join(row.ljust(stride, ".") for row in data)
+    offsets = [dx + dy * stride for dx, dy in steps]
+    start = grid.index("S")
+
+    def enters(position, d):
+        return 0 <= position < len(grid) and (grid[position], d) in turns
+
+    d = next(d for d in range(4) if enters(start + offsets[d], d))
+    position, (x, y) = start, divmod(start, stride)[::-1]
+    length = area = 0
+    while True:
+        dx, dy = steps[d]
+        area += x * dy
+        x, y = x + dx, y + dy
+        position += offsets[d]
+        length += 1
+        if position == start:
             break
-    else:
-        assert False, "Loop pipe was only connected on one side?"
-
-print(len(loop_vertices) // 2)
-
-left_of_loop_vertices = set()
-loop_vertices_set = set(loop_vertices)
-for a, b in more_itertools.pairwise(loop_vertices):
-    direction = b[0] - a[0], b[1] - a[1]
-    left_direction = directions[(directions.index(direction) + 1) % len(directions)]
-    for lx, ly in (a, b):
-        nx = lx + left_direction[0]
-        ny = ly + left_direction[1]
-        if (
-            0 <= ny < len(data)
-            and 0 <= nx < len(data[ny])
-            and (nx, ny) not in loop_vertices_set
-        ):
-            left_of_loop_vertices.add((nx, ny))
-
-comp_index_of = dict()
-comp_count = 0
-for sy in range(len(data)):
-    for sx in range(len(data[sy])):
-        if (sx, sy) not in loop_vertices_set and (sx, sy) not in comp_index_of:
-            comp_index_of[(sx, sy)] = comp_count
-            comp_count += 1
-            stack = [(sx, sy)]
-            while stack:
-                x, y = stack.pop()
-                for direction in directions:
-                    nx = x + direction[0]
-                    ny = y + direction[1]
-                    if (
-                        0 <= ny < len(data)
-                        and 0 <= nx < len(data[ny])
-                        and (nx, ny) not in loop_vertices_set
-                        and (nx, ny) not in comp_index_of
-                    ):
-                        comp_index_of[(nx, ny)] = comp_index_of[(x, y)]
-                        stack.append((nx, ny))
-
-comps = [[] for _ in range(comp_count)]
-for v, comp_index in comp_index_of.items():
-    comps[comp_index].append(v)
-
-# Holds in all examples; otherwise, find another outside vertex
-assert (0, 0) not in loop_vertices_set
-
-left_of_loop_comp_indices = [
-    i for i, comp in enumerate(comps) if any(v in left_of_loop_vertices for v in comp)
-]
-left_of_loop_count = sum(len(comps[i]) for i in left_of_loop_comp_indices)
-inside_count = (
-    left_of_loop_count
-    if comp_index_of[(0, 0)] not in left_of_loop_comp_indices
-    else sum(map(len, data)) - left_of_loop_count - len(loop_vertices)
-)
-
-print(inside_count)
-
-# for y in range(len(data)):
-#     for x in range(len(data[y])):
-#         if (x, y) in loop_vertices_set:
-#             print("#", end="")
-#         elif (x, y) in left_of_loop_vertices:
-#             print("L", end="")
-#         elif comp_index_of[(x, y)] in left_of_loop_comp_indices:
-#             print("l", end="")
-#         else:
-#             print(".", end="")
-#     print()
+        d = turns[grid[position], d]
+
+    return length, abs(area)
+
+
+def solve(text):
+    length, area = trace_loop(text.splitlines())
+    yield length // 2
+    # Pick's theorem, with the loop tiles as the boundary points
+    yield area - length // 2 + 1
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
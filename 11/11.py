@@ -7,26 +7,56 @@ from pathlib import Path
 EXPANSIONS = [2, 1000000]
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().splitlines()
-
-vertices = [
-    (x, y) for y in range(len(data)) for x in range(len(data[y])) if data[y][x] == "#"
-]
-empty_rows = {y for y in range(len(data)) if "#" not in data[y]}
-empty_cols = {
-    x
-    for x in range(len(data[0]))
-    if not any(data[y][x] == "#" for y in range(len(data)))
-}
-
-for expansion in EXPANSIONS:
-    total = sum(
-        abs(ux - vx)
-        + abs(uy - vy)
-        + (expansion - 1) * len(set(range(min(uy, vy), max(uy, vy))) & empty_rows)
-        + (expansion - 1) * len(set(range(min(ux, vx), max(ux, vx))) & empty_cols)
-        for i, (ux, uy) in enumerate(vertices)
-        for vx, vy in vertices[:i]
-    )
-    print(total)
+def axis_sums(counts):
+    """Sums up the distances along one axis over all pairs of galaxies.
+
+    `counts[c]` is the number of galaxies at coordinate `c`. Returns the summed
+    distances and the summed number of empty lines between the pairs, so that
+    the distances after expanding by `e` are `distances + (e - 1) * crossings`.
+    Since the coordinates are walked in order, the sums over the earlier
+    galaxies are prefix sums.
+    """
+    distances = crossings = 0
+    seen = coordinate_sum = empty_sum = 0
+    empty_before = 0
+    for c, k in enumerate(counts):
+        if k == 0:
+            empty_before += 1
+            continue
+        distances += k * (seen * c - coordinate_sum)
+        crossings += k * (seen * empty_before - empty_sum)
+        seen += k
+        coordinate_sum += k * c
+        empty_sum += k * empty_before
+    return distances, crossings
+
+
+def solve(text, expansions=EXPANSIONS):
+    data = text.splitlines()
+
+    row_counts = [row.count("#") for row in data]
+    col_counts = [0] * max(map(len, data), default=0)
+    for row in data:
+        x = row.find("#")
+        while x != -1:
+            col_counts[x] += 1
+            x = row.find("#", x + 1)
+
+    row_distances, row_crossings = axis_sums(row_counts)
+    col_distances, col_crossings = axis_sums(col_counts)
+    distances = row_distances + col_distances
+    crossings = row_crossings + col_crossings
+
+    for expansion in expansions:
+        yield distances + (expansion - 1) * crossings
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
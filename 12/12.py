@@ -1,43 +1,122 @@
 #!/usr/bin/env python3
 
-import itertools
+import argparse
+import os
 import sys
-from functools import cache
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import accumulate, islice
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().splitlines()
+def possibilities(positions, lengths):
+    """Counts the arrangements of the groups of damaged springs in a row.
 
+    `ways[i]` is the number of arrangements of the groups processed so far (from
+    the last one backwards) in `positions[i:]`. With the prefix counts of "#" and
+    "." each check is constant time, so a row costs O(len(positions) * groups),
+    and only two tables of the row's length are kept.
+    """
+    positions += "."
+    n = len(positions)
+    hashes = [0, *accumulate(c == "#" for c in positions)]
+    dots = [0, *accumulate(c == "." for c in positions)]
+
+    ways = [int(hashes[n] == hashes[i]) for i in range(n + 1)]
+    next_ways = [0] * (n + 1)
+    for length in reversed(lengths):
+        next_ways[n] = 0
+        for i in reversed(range(n)):
+            count = next_ways[i + 1] if positions[i] != "#" else 0
+            end = i + length
+            if end < n and dots[end] == dots[i] and positions[end] != "#":
+                count += ways[end + 1]
+            next_ways[i] = count
+        ways, next_ways = next_ways, ways
+    return ways[0]
+
+
+def unfold(positions, lengths, factor):
+    return "?".join([positions] * factor), lengths * factor
+
+
+def parse_rows(lines):
+    for line in lines:
+        if not line.strip():
+            continue
+        positions, lengths_str = line.split(" ", 1)
+        yield positions, tuple(map(int, lengths_str.split(",")))
 
-@cache
-def possibilities(positions, lengths):
-    if len(positions) == 0:
-        return len(lengths) == 0
-    if len(lengths) == 0:
-        return "#" not in positions
-
-    l1 = lengths[0]
-    return sum(
-        possibilities(positions[i + l1 + 1 :], lengths[1:])
-        for i in range(len(positions) - l1)
-        if "#" not in positions[:i]
-        and "." not in positions[i : i + l1]
-        and "#" != positions[i + l1]
-    )
 
+def chunk_sums(rows, factor=5):
+    """Sums up both parts over a chunk of rows and times it, in a worker."""
+    before = time.perf_counter()
+    total1 = total2 = 0
+    for positions, lengths in rows:
+        total1 += possibilities(positions, lengths)
+        total2 += possibilities(*unfold(positions, lengths, factor))
+    return total1, total2, len(rows), time.perf_counter() - before
 
-total1 = total2 = 0
 
-for line in data:
-    positions, lengths_str = line.split(" ", 1)
-    lengths = list(map(int, lengths_str.split(",")))
+def batch_sums(lines, factor=5, chunk_size=1000, processes=None):
+    """Sums up both parts of a stream of rows in chunks on a pool of processes.
+
+    At most two chunks per worker are in flight, so the rows are read only as
+    fast as the pool gets through them. The time of each chunk is reported on
+    stderr, in the order in which the chunks finish.
+    """
+    processes = processes or os.cpu_count()
+    rows = parse_rows(lines)
+    chunks = enumerate(iter(lambda: list(islice(rows, chunk_size)), []))
+    total1 = total2 = 0
+    with ProcessPoolExecutor(processes) as pool:
+        in_flight = {}
+        while True:
+            while len(in_flight) < 2 * processes and (item := next(chunks, None)):
+                i, chunk = item
+                in_flight[pool.submit(chunk_sums, chunk, factor)] = i
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = in_flight.pop(future)
+                sum1, sum2, count, seconds = future.result()
+                print(f"chunk {i}: {count} rows in {seconds:.4f}s", file=sys.stderr)
+                total1 += sum1
+                total2 += sum2
+    return total1, total2
+
+
+def solve(text, factor=5):
+    rows = list(parse_rows(text.splitlines()))
+
+    yield sum(possibilities(positions, lengths) for positions, lengths in rows)
+    yield sum(possibilities(*unfold(*row, factor)) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename", nargs="?", default="input")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="evaluate the rows in chunks on a pool of worker processes",
+    )
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--jobs", type=int, help="number of worker processes (default: all cores)"
+    )
+    args = parser.parse_args()
 
-    total1 += possibilities(positions + ".", tuple(lengths))
+    input_path = Path(__file__).parent / args.filename
+    if args.batch:
+        with input_path.open() as lines:
+            answers = batch_sums(lines, chunk_size=args.chunk_size, processes=args.jobs)
+    else:
+        answers = solve(input_path.read_text())
+    for answer in answers:
+        print(answer)
 
-    positions = "?".join(itertools.repeat(positions, 5))
-    lengths *= 5
-    total2 += possibilities(positions + ".", tuple(lengths))
 
-print(total1)
-print(total2)
+if __name__ == "__main__":
+    main()
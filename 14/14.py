@@ -1,100 +1,106 @@
 #!/usr/bin/env python3
 
+import hashlib
 import itertools
 import sys
-from collections import Counter
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-grid = (Path(__file__).parent / filename).read_text().splitlines()
-
-
-def load_of(moving_points, *, height):
-    return sum(height - y for x, y in moving_points)
-
-
-def move_north(solid_points, moving_points, *, height, width):
-    new_moving_points = []
-
-    for x in range(width):
-        first = 0
-        stacked_up = Counter()
-        for y in range(height):
-            if (x, y) in solid_points:
-                first = y + 1
-            elif (x, y) in moving_points:
-                stacked_up[first] += 1
-
-        for first, count in stacked_up.items():
-            for i in range(count):
-                new_moving_points.append((x, first + i))
+def shift(mask, offset):
+    return mask << offset if offset > 0 else mask >> -offset
+
+
+class Dish:
+    """The dish as bitboards, with bit `y * stride + x` standing for the cell at `(x, y)`.
+
+    Every row is followed by a padding bit that is never open, so rocks that are
+    tilted west or east stop at the edges. The fixed rocks are folded into the
+    `open` mask once.
+    """
+
+    def __init__(self, grid):
+        self.height = len(grid)
+        self.stride = len(grid[0]) + 1
+
+        self.open = self.mask_of(grid, ".O")
+        self.rocks = self.mask_of(grid, "O")
+        self.north, self.west, self.south, self.east = -self.stride, -1, self.stride, 1
+
+        # The load of a row is `height - y`; grouping the rows by the bits of their
+        # load turns the total load into a few popcounts
+        self.load_masks = []
+        for bit in range(self.height.bit_length()):
+            row = (1 << (self.stride - 1)) - 1
+            self.load_masks.append(
+                sum(
+                    row << y * self.stride
+                    for y in range(self.height)
+                    if (self.height - y) >> bit & 1
+                )
+            )
+
+    def mask_of(self, grid, kinds):
+        mask = 0
+        for y, row in enumerate(grid):
+            for x, c in enumerate(row):
+                if c in kinds:
+                    mask |= 1 << (y * self.stride + x)
+        return mask
+
+    def tilt(self, rocks, step):
+        """Moves all rocks that can go one cell by `step` at once, until none can."""
+        while can_move := rocks & shift(self.open & ~rocks, -step):
+            rocks ^= can_move | shift(can_move, step)
+        return rocks
+
+    def spin_cycle(self, rocks):
+        for step in (self.north, self.west, self.south, self.east):
+            rocks = self.tilt(rocks, step)
+        return rocks
+
+    def digest(self, rocks):
+        # hash() of an int is its value modulo a Mersenne prime, which does not
+        # change when a rock moves by a multiple of 61 bits
+        size = (self.height * self.stride + 7) // 8
+        return hashlib.blake2b(rocks.to_bytes(size, "little"), digest_size=16).digest()
+
+    def load(self, rocks):
+        return sum(
+            (rocks & mask).bit_count() << bit
+            for bit, mask in enumerate(self.load_masks)
+        )
 
-    return frozenset(new_moving_points)
 
+def solve(text, target=1000000000):
+    dish = Dish(text.split())
 
-def rotate_clockwise(points, *, width):
-    return frozenset((width - 1 - y, x) for x, y in points)
+    yield dish.load(dish.tilt(dish.rocks, dish.north))
 
+    # Only a digest of every state is kept, together with the load that is needed
+    # for the answer
+    iteration_of_digest = dict()
+    load_of_iteration = []
 
-height = len(grid)
-width = len(grid[0])
-solid_points = frozenset(
-    (x, y) for y, row in enumerate(grid) for x, c in enumerate(row) if c == "#"
-)
-moving_points = frozenset(
-    (x, y) for y, row in enumerate(grid) for x, c in enumerate(row) if c == "O"
-)
+    rocks = dish.rocks
+    for i in itertools.count():
+        key = dish.digest(rocks)
+        if key in iteration_of_digest:
+            cycle_start = iteration_of_digest[key]
+            cycle_length = i - cycle_start
+            equiv_target = cycle_start + ((target - cycle_start) % cycle_length)
+            yield load_of_iteration[equiv_target]
+            break
+        iteration_of_digest[key] = i
+        load_of_iteration.append(dish.load(rocks))
+        rocks = dish.spin_cycle(rocks)
 
-print(
-    load_of(
-        move_north(solid_points, moving_points, height=height, width=width),
-        height=height,
-    )
-)
 
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
 
-def spin_cycle(solid_points, moving_points, *, height, width):
-    for _ in range(4):
-        new_moving_points = move_north(
-            solid_points, moving_points, height=height, width=width
-        )
-
-        height, width, solid_points, moving_points = (
-            width,
-            height,
-            rotate_clockwise(solid_points, width=width),
-            rotate_clockwise(new_moving_points, width=width),
-        )
 
-    return moving_points
-
-
-iteration_of_state = dict()
-state_of_iteration = []
-
-for i in itertools.count():
-    # print("=" * 20)
-    # print(i)
-    # print(load_of(height, width, solid_points, moving_points))
-    # for y in range(height):
-    #     for x in range(width):
-    #         if (x, y) in solid_points:
-    #             print("#", end="")
-    #         elif (x, y) in moving_points:
-    #             print("O", end="")
-    #         else:
-    #             print(".", end="")
-    #     print()
-
-    key = moving_points
-    if key in iteration_of_state:
-        cycle_start = iteration_of_state[key]
-        cycle_length = i - cycle_start
-        target = 1000000000
-        equiv_target = cycle_start + ((target - cycle_start) % cycle_length)
-        print(load_of(state_of_iteration[equiv_target], height=height))
-        break
-    iteration_of_state[key] = i
-    state_of_iteration.append(key)
-    moving_points = spin_cycle(solid_points, moving_points, height=height, width=width)
+if __name__ == "__main__":
+    main()
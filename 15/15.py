@@ -1,60 +1,170 @@
 #!/usr/bin/env python3
 
 import sys
-from dataclasses import dataclass, field
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().removesuffix("\n")
+# HASH after adding a byte is TIMES_17[(h + byte) % 256]
+TIMES_17 = bytes(i * 17 % 256 for i in range(256))
 
 
-def string_hash(s):
-    h = 0
-    for c in s:
-        h += ord(c)
-        h *= 17
-        h %= 256
+def string_hash(s, h=0):
+    """HASH of `s`, or of `s` following a string whose HASH is `h`."""
+    for byte in s:
+        h = TIMES_17[(h + byte) & 0xFF]
     return h
 
 
-print(sum(map(string_hash, data.split(","))))
+def steps_of(chunks):
+    """Splits a stream of chunks of the sequence into its comma separated steps."""
+    rest = b""
+    for chunk in chunks:
+        *steps, rest = (rest + chunk).split(b",")
+        yield from steps
+    rest = rest.rstrip(b"\n")
+    if rest:
+        yield rest
+
+
+class FenwickTree:
+    """Prefix sums over a list that only grows at the end."""
+
+    def __init__(self, values=()):
+        # Each node adds itself to its parent, which builds the tree in O(n)
+        self.tree = [0, *values]
+        for i in range(1, len(self.tree)):
+            if (parent := i + (i & -i)) < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def prefix(self, i):
+        """The sum of the first `i` values."""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i &= i - 1
+        return total
+
+    def append(self, value):
+        # The new node covers the nodes from i - 1 down to its lowest bit
+        i = len(self.tree)
+        j = i - 1
+        while j > i & (i - 1):
+            value += self.tree[j]
+            j &= j - 1
+        self.tree.append(value)
+
+    def add(self, i, delta):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+
+# A slot of a box is packed into `focal_length << COUNT_BITS | occupied`, so that
+# one tree sums up both the focal lengths and the occupied slots
+COUNT_BITS = 32
+COUNT_MASK = (1 << COUNT_BITS) - 1
 
 
-@dataclass
 class Box:
-    box_id: int
-    time = 0
-    lenses: dict = field(default_factory=dict)
+    """The lenses of a box, in the slots in which they were inserted.
 
-    def remove_lens(self, label):
-        if label in self.lenses:
-            del self.lenses[label]
+    Removed lenses leave empty slots behind, so the rank of a lens is the number
+    of occupied slots up to its own. Once fewer than half of the slots are
+    occupied, the lenses are moved together, which keeps the slots within twice
+    the number of lenses.
+    """
+
+    def __init__(self):
+        self.slot_of = {}
+        self.focal_lengths = []
+        self.total_focal_length = 0
+        self.slots = FenwickTree()
 
     def insert_or_assign(self, label, focal_length):
-        if label in self.lenses:
-            insertion_time = self.lenses[label][0]
+        """Returns the change of the box's focusing power, per box number."""
+        if (slot := self.slot_of.get(label)) is not None:
+            delta = focal_length - self.focal_lengths[slot]
+            self.focal_lengths[slot] = focal_length
+            self.total_focal_length += delta
+            rank = self.slots.prefix(slot + 1) & COUNT_MASK
+            self.slots.add(slot, delta << COUNT_BITS)
+            return rank * delta
+
+        self.slot_of[label] = len(self.focal_lengths)
+        self.focal_lengths.append(focal_length)
+        self.total_focal_length += focal_length
+        self.slots.append(focal_length << COUNT_BITS | 1)
+        return len(self.slot_of) * focal_length
+
+    def remove_lens(self, label):
+        """Returns the change of the box's focusing power, per box number."""
+        if (slot := self.slot_of.pop(label, None)) is None:
+            return 0
+        focal_length = self.focal_lengths[slot]
+        up_to, rank = divmod(self.slots.prefix(slot + 1), 1 << COUNT_BITS)
+        # All lenses behind the removed one move forward by one rank
+        delta = -rank * focal_length - (self.total_focal_length - up_to)
+        self.focal_lengths[slot] = 0
+        self.total_focal_length -= focal_length
+        if 2 * len(self.slot_of) < len(self.focal_lengths):
+            self.compact()
+        else:
+            self.slots.add(slot, -(focal_length << COUNT_BITS | 1))
+        return delta
+
+    def compact(self):
+        # The labels are in the order of their slots, since new ones are appended
+        self.focal_lengths = [self.focal_lengths[s] for s in self.slot_of.values()]
+        self.slot_of = {label: slot for slot, label in enumerate(self.slot_of)}
+        self.slots = FenwickTree(f << COUNT_BITS | 1 for f in self.focal_lengths)
+
+
+class HashMap:
+    """The boxes, with the total focusing power kept up to date after every step."""
+
+    def __init__(self):
+        self.boxes = [Box() for _ in range(256)]
+        self.box_of = {}
+        self.focusing_power = 0
+
+    def apply(self, step):
+        """Applies a step and returns its HASH."""
+        label, is_assignment, focal_length = step.partition(b"=")
+        if not is_assignment:
+            label = step[:-1]
+        if (box_id := self.box_of.get(label)) is None:
+            box_id = self.box_of[label] = string_hash(label)
+
+        # The HASH of the step goes on from the HASH of its label
+        if is_assignment:
+            delta = self.boxes[box_id].insert_or_assign(label, int(focal_length))
+            step_hash = string_hash(focal_length, TIMES_17[(box_id + ord("=")) & 0xFF])
         else:
-            insertion_time = self.time
-            self.time += 1
-        self.lenses[label] = (insertion_time, focal_length)
-
-    def total_focusing_power(self):
-        return sum(
-            (1 + self.box_id) * rank * focal_length
-            for rank, (_label, (_insertion_time, focal_length)) in enumerate(
-                sorted(self.lenses.items(), key=lambda t: t[1][0]), start=1
-            )
-        )
-
-
-boxes = list(map(Box, range(256)))
-for instruction in data.split(","):
-    if "=" in instruction:
-        label, focal_length_str = instruction.split("=", 1)
-        boxes[string_hash(label)].insert_or_assign(label, int(focal_length_str))
-    else:
-        label = instruction.removesuffix("-")
-        boxes[string_hash(label)].remove_lens(label)
-
-print(sum(map(Box.total_focusing_power, boxes)))
+            delta = self.boxes[box_id].remove_lens(label)
+            step_hash = TIMES_17[(box_id + ord("-")) & 0xFF]
+        self.focusing_power += (1 + box_id) * delta
+        return step_hash
+
+
+def initialization_sums(chunks):
+    total_hash = 0
+    hashmap = HashMap()
+    for step in steps_of(chunks):
+        total_hash += hashmap.apply(step)
+    return total_hash, hashmap.focusing_power
+
+
+def solve(text):
+    yield from initialization_sums([text.encode()])
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    with (Path(__file__).parent / filename).open("rb") as f:
+        for answer in initialization_sums(iter(lambda: f.read(1 << 16), b"")):
+            print(answer)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,79 +4,196 @@ import sys
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-grid = (Path(__file__).parent / filename).read_text().splitlines()
-
-
-class Direction:
-    north = (0, -1)
-    south = (0, 1)
-    west = (-1, 0)
-    east = (1, 0)
-
-
-def simulate(start):
-    stack = [start]
-    seen = set()
-
-    def push(x, y, d):
-        if (x, y, d) not in seen:
-            stack.append((x, y, d))
-            seen.add((x, y, d))
-
-    while stack:
-        x, y, dir = stack.pop()
-        nx, ny = x + dir[0], y + dir[1]
-        if not (0 <= ny < len(grid) and 0 <= nx < len(grid[ny])):
-            continue
-        match (dir, grid[ny][nx]):
-            case (_, "."):
-                push(nx, ny, dir)
-            case (Direction.north, "\\"):
-                push(nx, ny, Direction.west)
-            case (Direction.west, "\\"):
-                push(nx, ny, Direction.north)
-            case (Direction.south, "\\"):
-                push(nx, ny, Direction.east)
-            case (Direction.east, "\\"):
-                push(nx, ny, Direction.south)
-            case (Direction.north, "/"):
-                push(nx, ny, Direction.east)
-            case (Direction.west, "/"):
-                push(nx, ny, Direction.south)
-            case (Direction.south, "/"):
-                push(nx, ny, Direction.west)
-            case (Direction.east, "/"):
-                push(nx, ny, Direction.north)
-            case (Direction.north | Direction.south, "|"):
-                push(nx, ny, dir)
-            case (Direction.west | Direction.east, "-"):
-                push(nx, ny, dir)
-            case (Direction.north | Direction.south, "-"):
-                push(nx, ny, Direction.west)
-                push(nx, ny, Direction.east)
-            case (Direction.west | Direction.east, "|"):
-                push(nx, ny, Direction.north)
-                push(nx, ny, Direction.south)
-
-    return len({(x, y) for x, y, _ in seen})
-
-
-print(simulate((-1, 0, Direction.east)))
-
-height = len(grid)
-width = len(grid[0])
-best = 0
-for y in range(height):
-    best = max(
-        best,
-        simulate((-1, y, Direction.east)),
-        simulate((width, y, Direction.west)),
-    )
-for x in range(len(grid[0])):
-    best = max(
-        best,
-        simulate((x, -1, Direction.south)),
-        simulate((x, height, Direction.north)),
-    )
-print(best)
+north, east, south, west = range(4)
+
+# (dx, dy) of each direction
+steps = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# The directions in which a beam leaves an element, for each direction it came in
+outgoing = {
+    "/": [[east], [north], [west], [south]],
+    "\\": [[west], [south], [east], [north]],
+    "|": [[north], [north, south], [south], [north, south]],
+    "-": [[east, west], [east], [east, west], [west]],
+}
+
+
+class Contraption:
+    """The contraption compiled into a graph between its optical elements.
+
+    A node `4 * e + d` is the beam leaving element `e` in direction `d`. Its edges
+    jump straight to the beams leaving the next element that it hits, and it
+    crosses the tiles on the way. The strongly connected components of the part
+    of the graph that the entry beams reach are collapsed, and each gets the
+    bitset of all tiles energized from it, with bit `y * width + x` standing for
+    the tile `(x, y)`. The energized tiles of every entry beam are counted while
+    the bitsets are built.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0])
+
+        self.elements = [
+            (x, y)
+            for y, row in enumerate(grid)
+            for x, c in enumerate(row)
+            if c in outgoing
+        ]
+        self.element_at = {pos: e for e, pos in enumerate(self.elements)}
+
+        self.entries = [
+            *((-1, y, east) for y in range(self.height)),
+            *((self.width, y, west) for y in range(self.height)),
+            *((x, -1, south) for x in range(self.width)),
+            *((x, self.height, north) for x in range(self.width)),
+        ]
+        targets = [self.trace(*start)[1] for start in self.entries]
+        component_of, components = self.collapse({v for ts in targets for v in ts})
+        entry_components = [{component_of[v] for v in ts} for ts in targets]
+        counts = self.energized_counts(components, entry_components)
+        self.energized_of_entry = dict(zip(self.entries, counts))
+
+    def trace(self, x, y, d):
+        """Follows a beam from `(x, y)` in direction `d` up to the next element."""
+        dx, dy = steps[d]
+        tiles = 0
+        while True:
+            x, y = x + dx, y + dy
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return tiles, []
+            tiles |= 1 << (y * self.width + x)
+            if (e := self.element_at.get((x, y))) is not None:
+                return tiles, [4 * e + d_out for d_out in outgoing[self.grid[y][x]][d]]
+
+    def beam(self, v):
+        e, d = divmod(v, 4)
+        return self.trace(*self.elements[e], d)
+
+    def collapse(self, roots):
+        """Tarjan's algorithm over the nodes reachable from the roots.
+
+        Returns the component of every reached node and the members and successor
+        components of every component, in the order in which they are finished.
+        Every component is finished after all of its successors.
+        """
+        successors = {}
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        component_of = {}
+        components = []
+
+        for root in roots:
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = low[v] = len(index)
+                    stack.append(v)
+                    on_stack.add(v)
+                    successors[v] = self.beam(v)[1]
+                if i < len(successors[v]):
+                    work.append((v, i + 1))
+                    w = successors[v][i]
+                    if w not in index:
+                        work.append((w, 0))
+                    continue
+
+                # Successors still on the stack are in a component that is not done yet
+                for w in successors[v]:
+                    if w in on_stack:
+                        low[v] = min(low[v], low[w])
+                if low[v] == index[v]:
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.remove(w)
+                        members.append(w)
+                        if w == v:
+                            break
+                    for w in members:
+                        component_of[w] = len(components)
+                    next_components = {
+                        component_of[u] for w in members for u in successors[w]
+                    }
+                    next_components.discard(len(components))
+                    components.append((members, next_components))
+        return component_of, components
+
+    def energized_counts(self, components, entry_components):
+        """The number of tiles energized by each entry beam.
+
+        The components are finished in order, and each entry beam is counted as
+        soon as the components that it leads into are. A bitset is dropped once
+        all components and entry beams before it have used it, and the tiles of
+        the nodes are traced again when needed instead of being kept.
+        """
+        users_left = [0] * len(components)
+        for _, next_components in components:
+            for c in next_components:
+                users_left[c] += 1
+        waiting_entries = [[] for _ in components]
+        for i, cs in enumerate(entry_components):
+            for c in cs:
+                users_left[c] += 1
+                waiting_entries[c].append(i)
+
+        tiles_of = {}
+
+        def use(cs):
+            tiles = 0
+            for c in cs:
+                tiles |= tiles_of[c]
+                users_left[c] -= 1
+                if users_left[c] == 0:
+                    del tiles_of[c]
+            return tiles
+
+        counts = [None] * len(self.entries)
+        components_left = [len(cs) for cs in entry_components]
+        for i, start in enumerate(self.entries):
+            if not entry_components[i]:
+                counts[i] = self.trace(*start)[0].bit_count()
+
+        for c, (members, next_components) in enumerate(components):
+            tiles = 0
+            for v in members:
+                tiles |= self.beam(v)[0]
+            tiles_of[c] = tiles | use(next_components)
+            for i in waiting_entries[c]:
+                components_left[i] -= 1
+                if components_left[i] == 0:
+                    tiles = self.trace(*self.entries[i])[0]
+                    counts[i] = (tiles | use(entry_components[i])).bit_count()
+        return counts
+
+    def energized(self, start):
+        """The number of energized tiles for a beam entering at `start`.
+
+        `start` is the position just outside the grid together with the direction.
+        """
+        return self.energized_of_entry[start]
+
+
+def solve(text):
+    contraption = Contraption(text.splitlines())
+
+    yield contraption.energized((-1, 0, east))
+
+    yield max(map(contraption.energized, contraption.entries))
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
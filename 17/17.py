@@ -1,69 +1,179 @@
 #!/usr/bin/env python3
 
-import heapq
 import sys
 from dataclasses import dataclass
-from enum import Enum
+from math import inf
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().splitlines()
-grid = [list(map(int, line)) for line in data]
-
-
-class Direction(Enum):
-    North = (0, -1)
-    East = (1, 0)
-    South = (0, 1)
-    West = (-1, 0)
-
-
-@dataclass(frozen=True, order=True)
-class Node:
-    x: int
-    y: int
-    is_left_horizontally: bool
-
-
-def min_heat_loss_for_forward_range(min_forward, max_forward):
-    dist = {Node(0, 0, False): 0, Node(0, 0, True): 0}
-    pq = [(v, k) for k, v in dist.items()]
-    heapq.heapify(pq)
-
-    while pq:
-        dist_then, node = heapq.heappop(pq)
-        if dist_then > dist[node]:
-            continue
-        directions = (
-            [Direction.West, Direction.East]
-            if node.is_left_horizontally
-            else [Direction.North, Direction.South]
-        )
-        for dir in directions:
-            dx, dy = dir.value
-            for i in range(min_forward, max_forward + 1):
-                nx = node.x + i * dx
-                ny = node.y + i * dy
-                if 0 <= ny < len(grid) and 0 <= nx < len(grid[ny]):
-                    new_node = Node(nx, ny, not node.is_left_horizontally)
-                    weight_along_edge = (
-                        sum(grid[node.y][x] for x in range(nx, node.x, -dx))
-                        if dx != 0
-                        else sum(grid[y][node.x] for y in range(ny, node.y, -dy))
-                    )
-                    if (
-                        new_node not in dist
-                        or dist[node] + weight_along_edge < dist[new_node]
-                    ):
-                        dist[new_node] = dist[node] + weight_along_edge
-                        heapq.heappush(pq, (dist[new_node], new_node))
-
-    return min(
-        dist[Node(len(grid[-1]) - 1, len(grid) - 1, False)],
-        dist[Node(len(grid[-1]) - 1, len(grid) - 1, True)],
-    )
-
-
-print(min_heat_loss_for_forward_range(1, 3))
-print(min_heat_loss_for_forward_range(4, 10))
+class City:
+    """The city map with its cells in flat lists, at index `y * width + x`.
+
+    The prefix sums of every row and column give the heat loss along a straight
+    move in constant time.
+    """
+
+    def __init__(self, grid):
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.heat_loss = [c for row in grid for c in row]
+
+        # row_sums[y * (width + 1) + x] is the sum of the first x cells of row y
+        self.row_sums = []
+        for row in grid:
+            total = 0
+            self.row_sums.append(total)
+            for c in row:
+                total += c
+                self.row_sums.append(total)
+        # col_sums[x * (height + 1) + y] is the sum of the first y cells of column x
+        self.col_sums = []
+        for x in range(self.width):
+            total = 0
+            self.col_sums.append(total)
+            for y in range(self.height):
+                total += grid[y][x]
+                self.col_sums.append(total)
+
+        self.max_heat_loss = max(self.heat_loss)
+        self.lower_bounds_to = {}
+
+    def lower_bounds(self, target):
+        """The least heat loss from every cell to `target`, without the crucible
+        rules, which makes it an admissible and consistent A* heuristic.
+
+        It is computed once per target and shared between all rule sets.
+        """
+        if target in self.lower_bounds_to:
+            return self.lower_bounds_to[target]
+        dist = [inf] * len(self.heat_loss)
+        buckets = [[] for _ in range(self.max_heat_loss + 1)]
+        dist[target] = 0
+        buckets[0].append(target)
+        pending = 1
+        d = 0
+        while pending:
+            bucket = buckets[d % len(buckets)]
+            while bucket:
+                cell = bucket.pop()
+                pending -= 1
+                if dist[cell] != d:
+                    continue
+                # Coming from a neighbour into `cell` loses the heat of `cell`
+                y, x = divmod(cell, self.width)
+                weight = self.heat_loss[cell]
+                for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if 0 <= nx < self.width and 0 <= ny < self.height:
+                        neighbour = ny * self.width + nx
+                        if d + weight < dist[neighbour]:
+                            dist[neighbour] = d + weight
+                            buckets[(d + weight) % len(buckets)].append(neighbour)
+                            pending += 1
+            d += 1
+        self.lower_bounds_to[target] = dist
+        return dist
+
+    def moves(self, cell, horizontally, min_forward, max_forward):
+        """The cells reachable with one straight move, with the heat loss on the way."""
+        y, x = divmod(cell, self.width)
+        if horizontally:
+            sums, base = self.row_sums, y * (self.width + 1)
+            line_length, i, step = self.width, x, 1
+        else:
+            sums, base = self.col_sums, x * (self.height + 1)
+            line_length, i, step = self.height, y, self.width
+        for j in range(i + min_forward, min(i + max_forward, line_length - 1) + 1):
+            yield cell + (j - i) * step, sums[base + j + 1] - sums[base + i + 1]
+        for j in range(i - min_forward, max(i - max_forward, 0) - 1, -1):
+            yield cell - (i - j) * step, sums[base + i] - sums[base + j]
+
+
+@dataclass
+class SearchStats:
+    """How much of the state space a search touched."""
+
+    states: int = 0
+    pushed: int = 0
+    expanded: int = 0
+
+
+def min_heat_loss_for_forward_range(
+    city,
+    min_forward,
+    max_forward,
+    start=(0, 0),
+    target=None,
+    astar=False,
+    stats=None,
+):
+    """Dijkstra's algorithm, or A* with `astar`, over the states
+    `2 * cell + horizontally`, where `horizontally` tells whether the next move
+    is horizontal. The search stops once the target is settled.
+
+    The priority of a state is its heat loss plus its lower bound to the target.
+    A move raises the priority by at most twice its heat loss, so a ring of that
+    many buckets plus one replaces the heap.
+    """
+    if target is None:
+        target = (city.width - 1, city.height - 1)
+    start_cell = start[1] * city.width + start[0]
+    target_cell = target[1] * city.width + target[0]
+    if astar:
+        bound = city.lower_bounds(target_cell)
+        max_increase = 2 * city.max_heat_loss * max_forward
+    else:
+        bound = [0] * len(city.heat_loss)
+        max_increase = city.max_heat_loss * max_forward
+    if stats is None:
+        stats = SearchStats()
+    stats.states = 2 * len(city.heat_loss)
+
+    dist = [inf] * stats.states
+    buckets = [[] for _ in range(max_increase + 1)]
+    for state in (2 * start_cell, 2 * start_cell + 1):
+        dist[state] = 0
+        buckets[bound[start_cell] % len(buckets)].append(state)
+    pending = stats.pushed = 2
+
+    f = bound[start_cell]
+    while pending:
+        bucket = buckets[f % len(buckets)]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            cell, horizontally = divmod(state, 2)
+            d = dist[state]
+            if d + bound[cell] != f:
+                continue
+            if cell == target_cell:
+                return d
+            stats.expanded += 1
+            moves = city.moves(cell, horizontally, min_forward, max_forward)
+            for next_cell, weight in moves:
+                next_state = 2 * next_cell + (not horizontally)
+                if d + weight < dist[next_state]:
+                    dist[next_state] = d + weight
+                    next_f = d + weight + bound[next_cell]
+                    buckets[next_f % len(buckets)].append(next_state)
+                    pending += 1
+                    stats.pushed += 1
+        f += 1
+
+    return inf
+
+
+def solve(text):
+    city = City([list(map(int, line)) for line in text.splitlines()])
+    yield min_heat_loss_for_forward_range(city, 1, 3, astar=True)
+    yield min_heat_loss_for_forward_range(city, 4, 10, astar=True)
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
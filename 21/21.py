@@ -2,57 +2,101 @@
 
 import sys
 from collections import deque
-from enum import Enum
-from itertools import product
+from itertools import accumulate
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-grid = (Path(__file__).parent / filename).read_text().splitlines()
-
-
-class Direction(Enum):
-    North = (0, -1)
-    East = (1, 0)
-    South = (0, 1)
-    West = (-1, 0)
-
-    def apply_to(self, position):
-        return position[0] + self.value[0], position[1] + self.value[1]
-
-
-def reachable_in_exactly(number_of_steps, starting_positions, blocked_positions):
-    if number_of_steps == 0:
-        return starting_positions
-    return reachable_in_exactly(
-        number_of_steps - 1,
-        {d.apply_to(p) for p in starting_positions for d in Direction}
-        - blocked_positions,
-        blocked_positions,
+class Garden:
+    """The garden with its plots in a flat list, at index `y * width + x`."""
+
+    def __init__(self, grid):
+        self.height = len(grid)
+        self.width = len(grid[0])
+        cells = "".join(grid)
+        self.start = cells.index("S")
+        self.is_plot = [c != "#" for c in cells]
+
+    def distances(self, source):
+        """The number of steps from `source` to every plot, or `None` if there is
+        no way, without leaving the garden."""
+        dist = [None] * len(self.is_plot)
+        dist[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            y, x = divmod(u, self.width)
+            neighbours = []
+            if x > 0:
+                neighbours.append(u - 1)
+            if x < self.width - 1:
+                neighbours.append(u + 1)
+            if y > 0:
+                neighbours.append(u - self.width)
+            if y < self.height - 1:
+                neighbours.append(u + self.width)
+            for v in neighbours:
+                if self.is_plot[v] and dist[v] is None:
+                    dist[v] = dist[u] + 1
+                    queue.append(v)
+        return dist
+
+
+def reachable_in_exactly(distances, step_counts):
+    """The number of plots reachable in exactly k steps, for each k of `step_counts`.
+
+    A plot can be reached in exactly k steps if its distance is at most k and of
+    the same parity, because the walk can step back and forth. Summing up the
+    histogram of the distances in steps of two answers every k at once.
+    """
+    histogram = [0] * (max(d for d in distances if d is not None) + 1)
+    for d in distances:
+        if d is not None:
+            histogram[d] += 1
+    same_parity_up_to = histogram[:2]
+    for d in range(2, len(histogram)):
+        same_parity_up_to.append(same_parity_up_to[d - 2] + histogram[d])
+
+    counts = []
+    for k in step_counts:
+        if k >= len(histogram):
+            k -= (k - len(histogram)) // 2 * 2 + 2
+        counts.append(same_parity_up_to[k] if k >= 0 else 0)
+    return counts
+
+
+def simulate_reachable_in_exactly(grid, number_of_steps):
+    """Brute forces the plots reachable in exactly `number_of_steps` steps in the
+    infinitely repeated garden, to validate the closed form for a few thousand
+    steps.
+
+    The garden is tiled far enough in every direction that the walk never gets
+    to the edge, and the set of reached plots is a bitboard over the tiling,
+    with a blocked padding bit after every row.
+    """
+    height, width = len(grid), len(grid[0])
+    tiles_x = 2 * (number_of_steps // width + 1) + 1
+    tiles_y = 2 * (number_of_steps // height + 1) + 1
+    stride = tiles_x * width + 1
+
+    rows = [row.replace("S", ".") * tiles_x for row in grid] * tiles_y
+    plots = int(
+        "".join(
+            "0" + row[::-1].replace("#", "0").replace(".", "1")
+            for row in reversed(rows)
+        ),
+        2,
     )
 
+    start = next((y, row.index("S")) for y, row in enumerate(grid) if "S" in row)
+    sy = start[0] + tiles_y // 2 * height
+    sx = start[1] + tiles_x // 2 * width
+    reached = 1 << (sy * stride + sx)
+    for _ in range(number_of_steps):
+        reached = (
+            reached << 1 | reached >> 1 | reached << stride | reached >> stride
+        ) & plots
+    return reached.bit_count()
 
-blocked_positions = set()
-starting_positions = set()
-for y, row in enumerate(grid):
-    for x, val in enumerate(row):
-        match val:
-            case "S":
-                starting_positions.add((x, y))
-            case "#":
-                blocked_positions.add((x, y))
-
-height = len(grid)
-width = len(grid[0])
-
-for y in range(height):
-    blocked_positions.add((-1, y))
-    blocked_positions.add((width, y))
-for x in range(width):
-    blocked_positions.add((x, -1))
-    blocked_positions.add((x, height))
-
-print(len(reachable_in_exactly(64, starting_positions, blocked_positions)))
 
 ####
 
@@ -75,127 +119,123 @@ print(len(reachable_in_exactly(64, starting_positions, blocked_positions)))
 #     => but we also enter delayed elsewhere, right?
 
 
-def distances_in_bounded_grid(grid, start):
-    dist = dict()
-    dist[start] = 0
-    queue = deque([start])
-    while queue:
-        u = queue.popleft()
-        for direction in Direction:
-            v = vx, vy = direction.apply_to(u)
-            if (
-                0 <= vy < len(grid)
-                and 0 <= vx < len(grid[vy])
-                and grid[vy][vx] != "#"
-                and v not in dist
-            ):
-                dist[v] = dist[u] + 1
-                queue.append(v)
-    return dist
-
-
-def rotate_clockwise(grid):
-    height = len(grid)
-    width = len(grid[0])
-    rotated = [[None] * height for _ in range(width)]
-    for y, row in enumerate(grid):
-        for x, val in enumerate(row):
-            rotated[x][width - 1 - y] = val
-    return rotated
-
-
-def gauss_sum(k):
-    return (k * (k + 1)) // 2
-
-
-def infinite_reachable_in_exactly_with_assumptions(grid, start, number_of_steps):
-    assert len(grid) == len(grid[0])
-    n = len(grid)
-    assert n % 2 == 1
-
-    edge_of_grid = set(product([0, n - 1], range(n))) | set(
-        product(range(n), [0, n - 1])
-    )
-    assert len(blocked_positions & edge_of_grid) == 0
-
-    def for_north_and_first_quadrant(grid, start):
-        distances_from_start = distances_in_bounded_grid(grid, start)
-        d_start_top = distances_from_start[(start[0], 0)]
-        d_start_top_right = distances_from_start[(n - 1, 0)]
-        distances_from_bottom_edge = distances_in_bounded_grid(grid, (start[0], n - 1))
-        distances_from_bottom_right = distances_in_bounded_grid(grid, (0, n - 1))
-        total = 0
-        for y in range(n):
-            for x in range(n):
-                if (x, y) not in distances_from_start:
-                    continue
-                # north
-
-                # to reach the point (x, y) in a map k maps above the center map, we need to move
-                # - from the start to the top (distances_from_start[(start[0], 0)])
-                # - one step into the new map (1)
-                # - k-1 full maps north ((k-1) * n)
-                # - from there to (x, y) (distances_from_bottom_edge[point])
-                # and this all needs to be doable in number_of_steps, so
-                #
-                #     distances_from_start[(start[0], 0)] + 1 + (k-1) * height + distances_from_bottom_edge[point] <= number_of_steps
-                #     (k-1) * n <= number_of_steps - distances_from_start[(start[0], 0)] - 1 - distances_from_bottom_edge[point]
-
-                # how many k > 0 exist such that (x, y) is reachable in the map k maps above the start in exactly number_of_steps steps
-                # => any k' <= k with same parity suffices, that is, rounded up half of the k' <= k? where k is the maximum possible one
-
-                d_to_edge = d_start_top
-                d_from_edge = distances_from_bottom_edge[(x, y)]
-                # need max k with (k-1) * n <= number_of_steps - d_to_edge - d_from_edge - 1 and same parity
-                # either max k in general, or k decreased by one for parity
-                middle_bound = number_of_steps - d_to_edge - d_from_edge - 1
-                if middle_bound >= 0:
-                    k = (middle_bound // n) + 1
-                    if ((k - 1) * n) % 2 != middle_bound % 2:
-                        k -= 1
-                    assert k >= 0
-                    k = (k + 1) // 2
-                    total += k
-
-                # quadrant
-                d_to_edge = d_start_top_right
-                d_from_edge = distances_from_bottom_right[(x, y)]
-                # in first column next to start, we have the same situation as with north, but with slightly longer path
-                middle_bound = number_of_steps - d_to_edge - d_from_edge - 2
-                if middle_bound >= 0:
-                    k = (middle_bound // n) + 1
-                    if ((k - 1) * n) % 2 != middle_bound % 2:
-                        k -= 1
-                    assert k >= 0
-                    # now, the reachable maps look like a staircase, so in total we have the sum
-                    # sum roundup(i / 2) for i <= k
-                    # sum (i + 1) // 2 for i <= k
-                    # sum i/2 for even i <= k + sum (i + 1)/2 for odd i <= k
-                    # sum i/2 for even i <= k + sum i / 2 for even i <= k + 1
-                    # sum i for i <= k // 2 + sum i for i <= (k + 1) // 2
-                    total += gauss_sum(k // 2) + gauss_sum((k + 1) // 2)
-        return total
-
-    distances_from_start = distances_in_bounded_grid(grid, start)
-    in_center_map = sum(
-        1
-        for y in range(n)
-        for x in range(n)
-        if (x, y) in distances_from_start
-        and distances_from_start[(x, y)] <= number_of_steps
-        and distances_from_start[(x, y)] % 2 == number_of_steps % 2
-    )
-
-    total = in_center_map
-    for _ in range(4):
-        total += for_north_and_first_quadrant(grid, start)
-        grid = rotate_clockwise(grid)
-        # start is in the middle, no need to rotate
-    return total
-
-
-print(
-    infinite_reachable_in_exactly_with_assumptions(
-        grid, next(iter(starting_positions)), 26501365
-    )
-)
+def maps_in_reach(middle_bound, n):
+    """The largest k with (k - 1) * n <= middle_bound and of the same parity.
+
+    To reach a plot in the map k maps away in a straight line, the walk goes
+    from the start to the edge of the center map, one step into the next map,
+    k - 1 full maps across and from the entry of the last map to the plot. What
+    remains of the steps for the full maps is `middle_bound`.
+    """
+    k = (middle_bound // n) + 1
+    if ((k - 1) * n) % 2 != middle_bound % 2:
+        k -= 1
+    assert k >= 0
+    return k
+
+
+def infinite_reachable_in_exactly(garden, step_counts):
+    """The number of plots reachable in exactly k steps in the infinitely repeated
+    garden, for each k of `step_counts`.
+
+    The start's row and column and the edges of the garden must be free. Then a
+    plot in a map straight north is best entered at the bottom midpoint, and a
+    plot in a map north east at the bottom left corner, and so on. The distance
+    fields of the start and of the four midpoints and four corners are computed
+    once. The leftover distance of every plot in every direction then goes into
+    prefix sums by its residue modulo `2 * n`, so that a step count costs O(n).
+    """
+    n = garden.width
+    assert garden.height == n and n % 2 == 1
+    edge_of_grid = [(x, y) for x in range(n) for y in (0, n - 1)] + [
+        (x, y) for x in (0, n - 1) for y in range(n)
+    ]
+    assert all(garden.is_plot[y * n + x] for x, y in edge_of_grid)
+    sy, sx = divmod(garden.start, n)
+
+    def cell(x, y):
+        return y * n + x
+
+    # (exit of the center map, entry of the next map) for each way to leave
+    through_edges = [
+        (cell(sx, 0), cell(sx, n - 1)),
+        (cell(sx, n - 1), cell(sx, 0)),
+        (cell(0, sy), cell(n - 1, sy)),
+        (cell(n - 1, sy), cell(0, sy)),
+    ]
+    through_corners = [
+        (cell(0, 0), cell(n - 1, n - 1)),
+        (cell(n - 1, 0), cell(0, n - 1)),
+        (cell(0, n - 1), cell(n - 1, 0)),
+        (cell(n - 1, n - 1), cell(0, 0)),
+    ]
+
+    from_start = garden.distances(garden.start)
+    reachable = [v for v, d in enumerate(from_start) if d is not None]
+
+    period = 2 * n
+
+    def leftover_sums(ways, extra_steps):
+        # The leftover distance d of a plot in a direction is r + period * t. For
+        # every residue r, keep the prefix sums over t of the number of plots and
+        # ways, weighted by 1, t and t ** 2
+        histograms = [[] for _ in range(period)]
+        for exit_cell, entry_cell in ways:
+            from_entry = garden.distances(entry_cell)
+            for v in reachable:
+                d = from_start[exit_cell] + extra_steps + from_entry[v]
+                r, t = d % period, d // period
+                histogram = histograms[r]
+                histogram += [0] * (t + 1 - len(histogram))
+                histogram[t] += 1
+        return [
+            [
+                list(accumulate(c * t**p for t, c in enumerate(histogram)))
+                for p in range(3)
+            ]
+            for histogram in histograms
+        ]
+
+    # Entering a map straight across takes one step, diagonally two
+    edge_sums = leftover_sums(through_edges, 1)
+    corner_sums = leftover_sums(through_corners, 2)
+
+    totals = reachable_in_exactly(from_start, step_counts)
+    for i, number_of_steps in enumerate(step_counts):
+        for r in range(min(period, number_of_steps + 1)):
+            # The leftover r + period * t leaves room for k - 2 * t maps
+            k = maps_in_reach(number_of_steps - r, n)
+            t_max = (number_of_steps - r) // period
+
+            if sums := edge_sums[r][0]:
+                c, ct, _ = (s[min(t_max, len(sums) - 1)] for s in edge_sums[r])
+                # every other map on the line has the right parity
+                totals[i] += (k + 1) // 2 * c - ct
+
+            if sums := corner_sums[r][0]:
+                c, ct, ctt = (s[min(t_max, len(sums) - 1)] for s in corner_sums[r])
+                # the maps with the right parity form a staircase, so there are
+                # sum((j + 1) // 2 for j <= k) = x * (x + 1) / 2 summed over
+                # both x here, and then summed up over t
+                for x in (k // 2, (k + 1) // 2):
+                    totals[i] += (x * (x + 1) * c - (2 * x + 1) * ct + ctt) // 2
+    return totals
+
+
+def solve(text):
+    grid = text.splitlines()
+    garden = Garden(grid)
+
+    yield reachable_in_exactly(garden.distances(garden.start), [64])[0]
+    yield infinite_reachable_in_exactly(garden, [26501365])[0]
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,6 @@ from itertools import product
 from pathlib import Path
 
 
-filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-data = (Path(__file__).parent / filename).read_text().splitlines()
-
-
 class Direction(Enum):
     North = (0, -1)
     East = (1, 0)
@@ -51,24 +47,6 @@ class Brick:
         return product(*(range(start, end + 1) for start, end in self.dimensions))
 
 
-max_xy = max_z = 0
-
-bricks = []
-
-for i, line in enumerate(data):
-    start, end = line.strip().split("~")
-    start_coords = tuple(map(int, start.split(",")))
-    end_coords = tuple(map(int, end.split(",")))
-    brick = Brick(i, list(zip(start_coords, end_coords)))
-    bricks.append(brick)
-
-    for d1, d2 in brick.dimensions:
-        assert 0 <= d1 <= d2
-
-    max_xy = max(max_xy, brick.xs[1], brick.ys[1])
-    max_z = max(max_z, brick.zs[1])
-
-
 class BrickStack:
     def __init__(self, max_xy, max_z):
         self.max_xy = max_xy
@@ -109,19 +87,6 @@ class BrickStack:
         return g
 
 
-stack = BrickStack(max_xy, max_z)
-for brick in sorted(bricks, key=lambda brick: brick.zs[0]):
-    stack.push(brick)
-
-
-g = stack.graph()
-unsafe_to_remove = set()
-for u, vs in g.items():
-    if len(vs) == 1:
-        unsafe_to_remove.add(next(iter(vs)))
-print(len(bricks) - len(unsafe_to_remove))
-
-
 def transpose_graph(g):
     gT = {u: set() for u in g}
     for u, vs in g.items():
@@ -143,18 +108,61 @@ def reachable_without_visiting(g, start, removed_vertex):
     return seen
 
 
-ground = len(g)
-g[ground] = set()
-for brick in bricks:
-    if len(g[brick.index]) == 0:
-        g[brick.index].add(ground)
+def parse_bricks(data):
+    bricks = []
+    for i, line in enumerate(data):
+        start, end = line.strip().split("~")
+        start_coords = tuple(map(int, start.split(",")))
+        end_coords = tuple(map(int, end.split(",")))
+        brick = Brick(i, list(zip(start_coords, end_coords)))
+        bricks.append(brick)
+
+        for d1, d2 in brick.dimensions:
+            assert 0 <= d1 <= d2
+
+    return bricks
+
+
+def solve(text):
+    bricks = parse_bricks(text.splitlines())
+    max_xy = max(max(brick.xs[1], brick.ys[1]) for brick in bricks)
+    max_z = max(brick.zs[1] for brick in bricks)
+
+    stack = BrickStack(max_xy, max_z)
+    for brick in sorted(bricks, key=lambda brick: brick.zs[0]):
+        stack.push(brick)
+
+    g = stack.graph()
+    unsafe_to_remove = set()
+    for u, vs in g.items():
+        if len(vs) == 1:
+            unsafe_to_remove.add(next(iter(vs)))
+    yield len(bricks) - len(unsafe_to_remove)
+
+    ground = len(g)
+    g[ground] = set()
+    for brick in bricks:
+        if len(g[brick.index]) == 0:
+            g[brick.index].add(ground)
+
+    gT = transpose_graph(g)
+
+    falling_bricks_when_removing = {
+        brick.index: len(gT)
+        - len(reachable_without_visiting(gT, ground, brick.index))
+        - 1
+        for brick in bricks
+    }
+
+    yield sum(falling_bricks_when_removing.values())
 
-gT = transpose_graph(g)
 
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
 
-falling_bricks_when_removing = {
-    brick.index: len(gT) - len(reachable_without_visiting(gT, ground, brick.index)) - 1
-    for brick in bricks
-}
 
-print(sum(falling_bricks_when_removing.values()))
+if __name__ == "__main__":
+    main()
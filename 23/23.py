@@ -68,9 +68,8 @@ def longest_path_length_undirected(g, start, end):
     return max_len
 
 
-def main():
-    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-    grid = (Path(__file__).parent / filename).read_text().splitlines()
+def solve(text):
+    grid = text.splitlines()
 
     height = len(grid)
     width = len(grid[0])
@@ -105,10 +104,17 @@ def main():
             "<": [Direction.West],
         }
     )
-    print(longest_path_length_dag(g1, start, end))
+    yield longest_path_length_dag(g1, start, end)
 
     g2 = make_graph({c: list(Direction) for c in ".^>v<"})
-    print(longest_path_length_undirected(compress_graph(g2), start, end))
+    yield longest_path_length_undirected(compress_graph(g2), start, end)
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
 
 
 if __name__ == "__main__":
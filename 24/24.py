@@ -43,9 +43,8 @@ class Vec:
         return self.dimensions[2]
 
 
-def main():
-    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-    data = (Path(__file__).parent / filename).read_text().splitlines()
+def solve(text):
+    data = text.splitlines()
     lines = [tuple(Vec.from_str(v) for v in li.split(" @ ")) for li in data]
 
     count = 0
@@ -61,7 +60,7 @@ def main():
                 c = x1 + v1 * t1
                 if all(200000000000000 <= x <= 400000000000000 for x in [c.x, c.y]):
                     count += 1
-    print(count)
+    yield count
 
     USED_LINES = 3  # suffices to narrow it down to a single solution
 
@@ -77,7 +76,14 @@ def main():
 
     solution = sympy.solve(system, dict=True)
     assert len(solution) == 1
-    print(sum(solution[0][dim] for dim in p))
+    yield sum(solution[0][dim] for dim in p)
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
 
 
 if __name__ == "__main__":
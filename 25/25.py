@@ -6,9 +6,8 @@ from pathlib import Path
 import networkx as nx
 
 
-def main():
-    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
-    data = (Path(__file__).parent / filename).read_text().splitlines()
+def solve(text):
+    data = text.splitlines()
 
     g = nx.Graph()
 
@@ -20,7 +19,14 @@ def main():
     cut_value, partitions = nx.stoer_wagner(g)
     assert cut_value <= 3
     assert len(partitions) == 2
-    print(len(partitions[0]) * len(partitions[1]))
+    yield len(partitions[0]) * len(partitions[1])
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "input"
+    text = (Path(__file__).parent / filename).read_text()
+    for answer in solve(text):
+        print(answer)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import math
+import tracemalloc
+
+from generate import GENERATORS, generate
+from run import load_day, timed_parts
+
+
+# Sizes are in the unit of the day's generator, see `generate.py`.
+LADDERS = {
+    "01": [1000, 10000, 100000],
+    "03": [100, 300, 1000],
+    "04": [1000, 10000, 100000],
+    "05": [10, 30, 100, 300],
+    "06": [4, 5, 6, 7],
+    "07": [1000, 10000, 100000],
+    "08": [10, 30, 100, 300],
+    "09": [100, 1000, 10000],
+    "10": [50, 150, 450],
+    "11": [35, 70, 140, 280],
+    "12": [100, 1000, 10000],
+    "13": [100, 1000, 10000],
+    "14": [25, 50, 100, 200],
+    "15": [1000, 10000, 100000],
+    "16": [25, 50, 100, 200],
+    "17": [25, 50, 100, 200],
+    "18": [100, 1000, 10000],
+    "21": [33, 65, 131, 263],
+    "22": [100, 300, 1000, 3000],
+    "23": [3, 4, 5],
+    "24": [5, 20, 100, 300],
+    "25": [100, 300, 1000],
+}
+
+
+def measure(day, text, memory=True):
+    """Times each part of a day on `text` and optionally traces its peak memory.
+
+    Every run gets a freshly loaded module, so that caches do not leak between
+    sizes. The memory is traced in a separate run, because tracing slows the
+    solution down.
+    """
+    seconds = [s for _, s in timed_parts(load_day(day).solve, text)]
+    peak = None
+    if memory:
+        solve = load_day(day).solve
+        tracemalloc.start()
+        for _ in solve(text):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def scaling_exponent(previous, current):
+    """Slope of the time curve on a log-log scale, between two ladder steps."""
+    (size1, seconds1), (size2, seconds2) = previous, current
+    if min(seconds1, seconds2) <= 0 or size1 == size2:
+        return None
+    return math.log(seconds2 / seconds1) / math.log(size2 / size1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the days on synthetic inputs of growing size and record "
+        "the time and peak memory of each step of the size ladder."
+    )
+    parser.add_argument(
+        "days",
+        nargs="*",
+        default=["all"],
+        help='days to benchmark, like "11 12", or "all" (the default)',
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: list(map(int, s.split(","))),
+        help="comma separated size ladder, instead of the day's default",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=30,
+        help="skip the rest of a ladder once a step takes longer (default: 30)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the peak memory measurement"
+    )
+    parser.add_argument("--csv", metavar="FILE", help="also write the results here")
+    args = parser.parse_args()
+
+    days = sorted(LADDERS) if "all" in args.days else [d.zfill(2) for d in args.days]
+    for day in days:
+        if day not in GENERATORS:
+            parser.error(f"no generator for day {day}")
+
+    rows = []
+    print(
+        f"{'day':<4} {'size':>8} {'part 1':>10} {'part 2':>10} {'total':>10} "
+        f"{'peak MiB':>9} {'exponent':>8}"
+    )
+    for day in days:
+        previous = None
+        for size in args.sizes or LADDERS[day]:
+            text = generate(day, size, args.seed)
+            seconds, peak = measure(day, text, memory=not args.no_memory)
+            total = sum(seconds)
+            exponent = previous and scaling_exponent(previous, (size, total))
+            parts = [f"{s:9.4f}s" for s in seconds] + [""] * (2 - len(seconds))
+            print(
+                f"{day:<4} {size:>8} {parts[0]:>10} {parts[1]:>10} {total:9.4f}s "
+                + (f"{peak / 2**20:9.2f}" if peak is not None else f"{'-':>9}")
+                + (f" {exponent:8.2f}" if exponent is not None else f" {'-':>8}"),
+                flush=True,
+            )
+            rows.append(
+                {
+                    "day": day,
+                    "size": size,
+                    "seed": args.seed,
+                    "part1_seconds": seconds[0],
+                    "part2_seconds": seconds[1] if len(seconds) > 1 else "",
+                    "total_seconds": total,
+                    "peak_bytes": peak if peak is not None else "",
+                }
+            )
+            previous = size, total
+            if total > args.max_seconds:
+                break
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
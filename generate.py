@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import string
+import sys
+from itertools import count, product
+from math import comb
+
+
+DIGIT_WORDS = [
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+]
+
+
+def generate_01(rng, size, width=40):
+    """`size` calibration lines of up to `width` characters."""
+    lines = []
+    for _ in range(size):
+        pieces = [str(rng.randrange(1, 10))]
+        length = rng.randint(width // 2, width)
+        while sum(map(len, pieces)) < length:
+            match rng.randrange(3):
+                case 0:
+                    pieces.append(str(rng.randrange(1, 10)))
+                case 1:
+                    pieces.append(rng.choice(DIGIT_WORDS))
+                case 2:
+                    pieces.append(
+                        "".join(
+                            rng.choices(string.ascii_lowercase, k=rng.randint(1, 4))
+                        )
+                    )
+        rng.shuffle(pieces)
+        lines.append("".join(pieces))
+    return "\n".join(lines) + "\n"
+
+
+def generate_03(rng, size):
+    """A schematic with `size` rows and columns."""
+    grid = [["."] * size for _ in range(size)]
+    for y in range(size):
+        x = rng.randrange(3)
+        while x < size:
+            if rng.random() < 0.15:
+                grid[y][x] = rng.choice("*#+$/=%@&-")
+                x += 1
+            else:
+                number = str(rng.randrange(1, 1000))
+                if x + len(number) > size:
+                    break
+                grid[y][x : x + len(number)] = number
+                x += len(number)
+            x += rng.randint(1, 6)
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def generate_04(rng, size, winning=10, played=25):
+    """`size` scratchcards."""
+    width = len(str(size))
+    lines = []
+    for i in range(1, size + 1):
+        numbers = rng.sample(range(1, 100), winning + played - rng.randint(0, winning))
+        winning_numbers = numbers[:winning]
+        played_numbers = numbers[len(numbers) - played :]
+        lines.append(
+            f"Card {i:>{width}}: "
+            + " ".join(f"{n:>2}" for n in winning_numbers)
+            + " | "
+            + " ".join(f"{n:>2}" for n in played_numbers)
+        )
+    return "\n".join(lines) + "\n"
+
+
+ALMANAC_LAYERS = [
+    "seed-to-soil",
+    "soil-to-fertilizer",
+    "fertilizer-to-water",
+    "water-to-light",
+    "light-to-temperature",
+    "temperature-to-humidity",
+    "humidity-to-location",
+]
+
+
+def generate_05(rng, size, seed_ranges=10, universe=1 << 32):
+    """An almanac with `size` range lines per layer."""
+    seeds = []
+    for _ in range(seed_ranges):
+        start = rng.randrange(universe)
+        seeds += [start, rng.randrange(1, max(2, (universe - start) // seed_ranges))]
+    lines = ["seeds: " + " ".join(map(str, seeds))]
+    for layer in ALMANAC_LAYERS:
+        lines += ["", f"{layer} map:"]
+        cuts = sorted(rng.sample(range(1, universe), 2 * size))
+        sources = [(cuts[i], cuts[i + 1]) for i in range(0, len(cuts), 2)]
+        destinations = [start for start, _ in sources]
+        rng.shuffle(destinations)
+        for (start, end), dst in zip(sources, destinations):
+            lines.append(f"{dst} {start} {end - start}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_06(rng, size, races=4):
+    """Races whose concatenated time has `size` digits."""
+    races = min(races, size)
+    lengths = [size // races + (i < size % races) for i in range(races)]
+    times = [
+        rng.randrange(max(3, 10 ** (length - 1)), 10**length) for length in lengths
+    ]
+    records = [
+        rng.randrange((t // 2) * (t - t // 2) // 2, (t // 2) * (t - t // 2))
+        for t in times
+    ]
+    width = max(len(str(n)) for n in times + records) + 2
+    return (
+        "Time:    " + "".join(f"{t:>{width}}" for t in times) + "\n"
+        "Distance:" + "".join(f"{d:>{width}}" for d in records) + "\n"
+    )
+
+
+def generate_07(rng, size):
+    """`size` hands with bids."""
+    return "".join(
+        "".join(rng.choices("23456789TJQKA", k=5)) + f" {rng.randint(1, 1000)}\n"
+        for _ in range(size)
+    )
+
+
+def node_names(rng, amount, last_letters):
+    """Distinct node names that end in one of `last_letters`."""
+    letters = string.ascii_uppercase
+    for width in count(3):
+        capacity = 26 ** (width - 1) * len(last_letters)
+        if capacity >= 2 * amount:
+            break
+    names = []
+    for index in rng.sample(range(capacity), amount):
+        index, last = divmod(index, len(last_letters))
+        name = last_letters[last]
+        for _ in range(width - 1):
+            index, letter = divmod(index, 26)
+            name = letters[letter] + name
+        names.append(name)
+    return names
+
+
+def generate_08(rng, size, ghosts=6):
+    """A network with `size` instructions and `ghosts` start nodes.
+
+    Like the puzzle inputs, every start walks one step into a cycle of a multiple
+    of `size` steps, which has exactly one end node, at the offset of the cycle
+    length from the start.
+    """
+    directions = "".join(rng.choices("LR", k=size))
+    factors = rng.sample(range(3, 3 + 4 * ghosts), ghosts)
+    middle_names = iter(
+        node_names(
+            rng,
+            sum(size * factor for factor in factors),
+            string.ascii_uppercase[1:-1],
+        )
+    )
+    starts = ["AAA"] + node_names(rng, ghosts - 1, "A")
+    ends = ["ZZZ"] + node_names(rng, ghosts - 1, "Z")
+    while "AAA" in starts[1:] or "ZZZ" in ends[1:]:
+        starts[1:] = node_names(rng, ghosts - 1, "A")
+        ends[1:] = node_names(rng, ghosts - 1, "Z")
+
+    successor = {}
+    for start, end, factor in zip(starts, ends, factors):
+        # walk: start, prefix node, then the cycle, with the end at offset `cycle`
+        cycle = size * factor
+        walk = [start] + [next(middle_names) for _ in range(cycle)]
+        walk.insert(cycle, end)
+        walk.append(walk[2])
+        for step, (u, v) in enumerate(zip(walk, walk[1:])):
+            successor[u] = (directions[step % size], v)
+
+    nodes = list(successor)
+    rng.shuffle(nodes)
+    lines = [directions, ""]
+    for u in nodes:
+        direction, v = successor[u]
+        decoy = rng.choice(nodes)
+        left, right = (v, decoy) if direction == "L" else (decoy, v)
+        lines.append(f"{u} = ({left}, {right})")
+    return "\n".join(lines) + "\n"
+
+
+def generate_09(rng, size, length=21, max_degree=20):
+    """`size` histories of `length` values each."""
+    lines = []
+    for _ in range(size):
+        degree = rng.randint(0, min(max_degree, length - 2))
+        coefficients = [rng.randint(-20, 20) for _ in range(degree + 1)]
+        lines.append(
+            " ".join(
+                str(sum(c * comb(x, k) for k, c in enumerate(coefficients)))
+                for x in range(length)
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def generate_10(rng, size):
+    """A `size` by `size` pipe maze with a single loop through S."""
+    assert size >= 5
+    middle = size // 2
+    x0, x1 = 1, size - 3
+    tops = [rng.randint(1, middle - 1) for _ in range(size)]
+    bottoms = [rng.randint(middle + 1, size - 2) for _ in range(size)]
+
+    # corners of a histogram-shaped polygon, which is simple by construction
+    corners = []
+    for x in range(x0, x1 + 1):
+        corners += [(x, tops[x]), (x + 1, tops[x])]
+    for x in range(x1, x0 - 1, -1):
+        corners += [(x + 1, bottoms[x]), (x, bottoms[x])]
+
+    path = [corners[0]]
+    for x, y in corners[1:] + corners[:1]:
+        px, py = path[-1]
+        while (px, py) != (x, y):
+            px += (x > px) - (x < px)
+            py += (y > py) - (y < py)
+            path.append((px, py))
+    path.pop()
+
+    pipe_of_directions = {
+        frozenset({(0, -1), (0, 1)}): "|",
+        frozenset({(-1, 0), (1, 0)}): "-",
+        frozenset({(0, -1), (1, 0)}): "L",
+        frozenset({(0, -1), (-1, 0)}): "J",
+        frozenset({(-1, 0), (0, 1)}): "7",
+        frozenset({(1, 0), (0, 1)}): "F",
+    }
+    grid = [rng.choices(".|-LJ7F", k=size) for _ in range(size)]
+    for i, (x, y) in enumerate(path):
+        (px, py), (nx, ny) = path[i - 1], path[(i + 1) % len(path)]
+        grid[y][x] = pipe_of_directions[frozenset({(px - x, py - y), (nx - x, ny - y)})]
+    sx, sy = rng.choice(path)
+    grid[sy][sx] = "S"
+    on_path = set(path)
+    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+        if (sx + dx, sy + dy) not in on_path:
+            grid[sy + dy][sx + dx] = "."
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def generate_11(rng, size, galaxies=None):
+    """A `size` by `size` image with `galaxies` galaxies (default: size ** 2 / 50)."""
+    if galaxies is None:
+        galaxies = max(2, size * size // 50)
+    rows = rng.sample(range(size), max(1, size * 9 // 10))
+    cols = rng.sample(range(size), max(1, size * 9 // 10))
+    positions = set()
+    while len(positions) < min(galaxies, len(rows) * len(cols)):
+        positions.add((rng.choice(cols), rng.choice(rows)))
+    grid = [["."] * size for _ in range(size)]
+    for x, y in positions:
+        grid[y][x] = "#"
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def generate_12(rng, size, length=20):
+    """`size` rows of `length` springs each."""
+    lines = []
+    for _ in range(size):
+        springs = [rng.choice("#.") for _ in range(length)]
+        springs[rng.randrange(length)] = "#"
+        groups = [len(run) for run in "".join(springs).split(".") if run]
+        springs = [c if rng.random() < 0.6 else "?" for c in springs]
+        lines.append("".join(springs) + " " + ",".join(map(str, groups)))
+    return "\n".join(lines) + "\n"
+
+
+def reflection_mismatches(rows):
+    """Mismatching cells per column, for each horizontal reflection line."""
+    return [
+        [
+            sum(
+                rows[line - 1 - i][x] != rows[line + i][x]
+                for i in range(min(line, len(rows) - line))
+            )
+            for x in range(len(rows[0]))
+        ]
+        for line in range(1, len(rows))
+    ]
+
+
+def generate_13(rng, size, min_side=5, max_side=17):
+    """`size` patterns with one reflection each, and another one after a smudge."""
+    patterns = []
+    while len(patterns) < size:
+        height = rng.randint(min_side, max_side)
+        width = rng.randint(min_side, max_side)
+        line1 = rng.randint(1, (height - 1) // 2)
+        line2 = rng.randint(line1 + 1, height - 1)
+
+        # rows that must be equal under both reflections share a class
+        cls = list(range(height))
+
+        def find(i):
+            while cls[i] != i:
+                i = cls[i]
+            return i
+
+        for line in (line1, line2):
+            for i in range(min(line, height - line)):
+                cls[find(line - 1 - i)] = find(line + i)
+        row_of_class = {}
+        rows = []
+        for i in range(height):
+            if find(i) not in row_of_class:
+                row_of_class[find(i)] = rng.choices("#.", k=width)
+            rows.append(list(row_of_class[find(i)]))
+
+        # break the second reflection with a smudge outside of the first one
+        candidates = [
+            i for i in range(2 * line1, height) if 0 <= 2 * line2 - 1 - i < height
+        ]
+        if not candidates:
+            continue
+        smudge_y = rng.choice(candidates)
+        smudge_x = rng.randrange(width)
+        rows[smudge_y][smudge_x] = "#" if rows[smudge_y][smudge_x] == "." else "."
+
+        columns = [list(col) for col in zip(*rows)]
+        # exactly one perfect reflection, and exactly one that is off by a single
+        # cell; no other line may have all of its mismatches in a single lane
+        lanes = [
+            sorted(filter(None, mismatches))
+            for mismatches in reflection_mismatches(rows)
+            + reflection_mismatches(columns)
+        ]
+        if lanes.count([]) != 1 or lanes.count([1]) != 1:
+            continue
+        if any(len(lane) == 1 and lane != [1] for lane in lanes):
+            continue
+        if rng.random() < 0.5:
+            rows.reverse()
+        if rng.random() < 0.5:
+            rows = [list(col) for col in zip(*rows)]
+        patterns.append("".join("".join(row) + "\n" for row in rows))
+    return "\n".join(patterns)
+
+
+def generate_14(rng, size):
+    """A `size` by `size` dish."""
+    return "".join(
+        "".join(rng.choices(".O#", weights=(70, 20, 10), k=size)) + "\n"
+        for _ in range(size)
+    )
+
+
+def generate_15(rng, size, labels=None):
+    """An initialization sequence of `size` steps over `labels` distinct labels."""
+    if labels is None:
+        labels = max(1, size // 4)
+    pool = {
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(labels)
+    }
+    pool = sorted(pool)
+    steps = [
+        (f"{label}={rng.randint(1, 9)}" if rng.random() < 0.6 else f"{label}-")
+        for label in rng.choices(pool, k=size)
+    ]
+    return ",".join(steps) + "\n"
+
+
+def generate_16(rng, size):
+    """A `size` by `size` contraption."""
+    return "".join(
+        "".join(rng.choices(".\\/|-", weights=(90, 2.5, 2.5, 2.5, 2.5), k=size)) + "\n"
+        for _ in range(size)
+    )
+
+
+def generate_17(rng, size):
+    """A `size` by `size` city map."""
+    return "".join(
+        "".join(rng.choices("123456789", k=size)) + "\n" for _ in range(size)
+    )
+
+
+def histogram_polygon(rng, columns, max_width, max_height):
+    """Instructions tracing a simple rectilinear polygon with `4 * columns` edges."""
+    tops, bottoms = [], []
+    for heights, low in ((tops, 0), (bottoms, max_height + 1)):
+        while len(heights) < columns:
+            height = rng.randint(low, low + max_height)
+            if not heights or heights[-1] != height:
+                heights.append(height)
+    widths = [rng.randint(1, max_width) for _ in range(columns)]
+
+    def vertical(dy):
+        return ("D" if dy > 0 else "U"), abs(dy)
+
+    instructions = []
+    for i in range(columns):
+        instructions.append(("R", widths[i]))
+        if i + 1 < columns:
+            instructions.append(vertical(tops[i + 1] - tops[i]))
+    instructions.append(vertical(bottoms[-1] - tops[-1]))
+    for i in reversed(range(columns)):
+        instructions.append(("L", widths[i]))
+        if i > 0:
+            instructions.append(vertical(bottoms[i - 1] - bottoms[i]))
+    instructions.append(vertical(tops[0] - bottoms[0]))
+    return instructions
+
+
+def generate_18(rng, size):
+    """A dig plan with about `size` instructions (rounded to a multiple of 4)."""
+    columns = max(1, size // 4)
+    plan1 = histogram_polygon(rng, columns, 10, 10)
+    plan2 = histogram_polygon(rng, columns, 0xFFFFF // 4, 0xFFFFF // 4)
+    return "".join(
+        f"{direction1} {distance1} (#{distance2:05x}{'RDLU'.index(direction2)})\n"
+        for (direction1, distance1), (direction2, distance2) in zip(plan1, plan2)
+    )
+
+
+def generate_21(rng, size, rock_density=0.1):
+    """A `size` by `size` garden (rounded up to odd), with S in the center.
+
+    Like the puzzle inputs, the border and the row and column of S are free.
+    """
+    size |= 1
+    middle = size // 2
+    grid = [
+        [
+            (
+                "."
+                if x in (0, middle, size - 1)
+                or y in (0, middle, size - 1)
+                or rng.random() >= rock_density
+                else "#"
+            )
+            for x in range(size)
+        ]
+        for y in range(size)
+    ]
+    grid[middle][middle] = "S"
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def generate_22(rng, size, footprint=10, max_length=4):
+    """A snapshot of `size` falling bricks over a `footprint` by `footprint` area."""
+    occupied = set()
+    lines = []
+    height = max(10, 3 * size // footprint)
+    while len(lines) < size:
+        axis = rng.randrange(3)
+        length = rng.randint(1, max_length)
+        start = [
+            rng.randrange(footprint),
+            rng.randrange(footprint),
+            rng.randint(1, height),
+        ]
+        end = start.copy()
+        end[axis] += length - 1
+        if end[0] >= footprint or end[1] >= footprint:
+            continue
+        cubes = set(product(*(range(s, e + 1) for s, e in zip(start, end))))
+        if cubes & occupied:
+            continue
+        occupied |= cubes
+        lines.append(",".join(map(str, start)) + "~" + ",".join(map(str, end)))
+    return "\n".join(lines) + "\n"
+
+
+def generate_23(rng, size, spacing=8):
+    """A hiking map with a `size` by `size` lattice of junctions.
+
+    Junctions are joined by straight corridors of random lengths up to `spacing`,
+    with slopes at both ends that lead right or down, so that the map is a DAG
+    when the slopes are respected.
+    """
+    xs, ys = ([1], [1])
+    for junctions in (xs, ys):
+        while len(junctions) < size:
+            junctions.append(junctions[-1] + rng.randint(4, max(4, spacing)))
+    width, height = xs[-1] + 2, ys[-1] + 2
+    grid = [["#"] * width for _ in range(height)]
+    for (i, x), (j, y) in product(enumerate(xs), enumerate(ys)):
+        grid[y][x] = "."
+        if i + 1 < size:
+            for cx in range(x + 1, xs[i + 1]):
+                grid[y][cx] = ">" if cx in (x + 1, xs[i + 1] - 1) else "."
+        if j + 1 < size:
+            for cy in range(y + 1, ys[j + 1]):
+                grid[cy][x] = "v" if cy in (y + 1, ys[j + 1] - 1) else "."
+    grid[0][xs[0]] = "."
+    grid[height - 1][xs[-1]] = "."
+    return "".join("".join(row) + "\n" for row in grid)
+
+
+def generate_24(rng, size):
+    """`size` hailstones that a single thrown rock hits."""
+    rock_position = [rng.randrange(150 * 10**12, 450 * 10**12) for _ in range(3)]
+    rock_velocity = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(10**9, 10**12), size)
+    lines = []
+    for t in times:
+        velocity = [rng.choice([-1, 1]) * rng.randint(1, 300) for _ in range(3)]
+        position = [
+            p + t * (v - hv) for p, v, hv in zip(rock_position, rock_velocity, velocity)
+        ]
+        lines.append(
+            ", ".join(map(str, position)) + " @ " + ", ".join(map(str, velocity))
+        )
+    return "\n".join(lines) + "\n"
+
+
+def generate_25(rng, size, degree=4):
+    """A wiring diagram of `size` components that falls apart by cutting three wires."""
+    names = set()
+    while len(names) < size:
+        names.add("".join(rng.choices(string.ascii_lowercase, k=3)))
+    names = sorted(names)
+    rng.shuffle(names)
+    halves = [names[: size // 2], names[size // 2 :]]
+
+    edges = set()
+    for half in halves:
+        for i, u in enumerate(half):
+            # a ring keeps the half connected, the chords keep it from being cut
+            edges.add(frozenset({u, half[(i + 1) % len(half)]}))
+            for v in rng.sample(half, min(degree, len(half))):
+                if u != v:
+                    edges.add(frozenset({u, v}))
+    for u, v in zip(rng.sample(halves[0], 3), rng.sample(halves[1], 3)):
+        edges.add(frozenset({u, v}))
+
+    wires = {}
+    for edge in edges:
+        u, v = sorted(edge)
+        wires.setdefault(u, []).append(v)
+    return "".join(f"{u}: {' '.join(vs)}\n" for u, vs in wires.items())
+
+
+GENERATORS = {
+    name.removeprefix("generate_"): function
+    for name, function in globals().items()
+    if name.startswith("generate_")
+}
+
+
+def generate(day, size, seed=0, **params):
+    return GENERATORS[day](random.Random(seed), size, **params)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic input of a given size for one of the days."
+    )
+    parser.add_argument("day", choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="extra integer parameter of the day's generator, like galaxies=500",
+    )
+    args = parser.parse_args()
+
+    params = {}
+    for param in args.param:
+        name, value = param.split("=", 1)
+        params[name] = int(value)
+    sys.stdout.write(generate(args.day, args.size, args.seed, **params))
+
+
+if __name__ == "__main__":
+    main()
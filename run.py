@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib.util
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent
+
+
+def python_days():
+    return sorted(path.parent.name for path in ROOT.glob("[0-9][0-9]/[0-9][0-9].py"))
+
+
+def load_day(day):
+    path = ROOT / day / f"{day}.py"
+    spec = importlib.util.spec_from_file_location(f"day{day}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed_parts(solve, text):
+    """Runs a day's `solve` and yields `(answer, seconds)` for each of its parts.
+
+    Each part is timed from the end of the previous one, so work that is shared
+    between the parts (like parsing) is attributed to the part that does it first.
+    """
+    before = time.perf_counter()
+    for answer in solve(text):
+        after = time.perf_counter()
+        yield answer, after - before
+        before = time.perf_counter()
+
+
+def run_day(day, filename="input"):
+    solve = load_day(day).solve
+    text = (ROOT / day / filename).read_text()
+    return list(timed_parts(solve, text))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the Python solutions in a single process and time them."
+    )
+    parser.add_argument(
+        "days",
+        nargs="*",
+        default=["all"],
+        help='days to run, like "01 05 11", or "all" (the default)',
+    )
+    parser.add_argument(
+        "--input",
+        default="input",
+        help='name of the input file in the day\'s directory (default: "input")',
+    )
+    args = parser.parse_args()
+
+    available = python_days()
+    days = available if "all" in args.days else [d.zfill(2) for d in args.days]
+    for day in days:
+        if (ROOT / day / f"{day}.rs").exists():
+            parser.error(f"day {day} is a Rust program, use `cargo run --bin {day}`")
+        if day not in available:
+            parser.error(f"no Python solution for day {day}")
+
+    total = 0
+    for day in days:
+        if not (ROOT / day / args.input).exists():
+            print(f"{day}  (no {args.input!r} file, skipped)")
+            continue
+        day_total = 0
+        for part, (answer, seconds) in enumerate(run_day(day, args.input), start=1):
+            prefix = day if part == 1 else " " * len(day)
+            print(f"{prefix}  part {part}: {answer!s:<24} {seconds:10.4f}s")
+            day_total += seconds
+        print(f"{' ' * len(day)}  {'total':<32} {day_total:10.4f}s")
+        total += day_total
+    if len(days) > 1:
+        print(f"{'all':<36} {total:10.4f}s")
+
+
+if __name__ == "__main__":
+    main()